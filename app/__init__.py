@@ -65,6 +65,12 @@ def create_app(config_name='development'):
     # Create database tables
     with app.app_context():
         db.create_all()
+    
+    # Set up service clients once instead of on the first request
+    app.extensions['services'] = {}
+    if app.config.get('PRELOAD_SERVICES'):
+        from .services import preload_services
+        preload_services(app)
         
     return app
 
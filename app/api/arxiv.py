@@ -5,6 +5,7 @@ from flask_jwt_extended import jwt_required
 from marshmallow import Schema, fields, validate, ValidationError
 
 from ..services.arxiv_service import ArxivService
+from ..services import get_service
 from ..api.errors import error_response
 
 arxiv_bp = Blueprint('arxiv', __name__)
@@ -41,7 +42,7 @@ def search_papers():
         # Validate query parameters using the manually parsed dictionary
         params = search_schema.load(parsed_args)
         
-        arxiv_service = ArxivService()
+        arxiv_service = get_service(ArxivService)
         
         papers_list, total_results = arxiv_service.search_papers(
             topics=params.get('topics'), # .get() is fine, schema provides defaults
@@ -73,7 +74,7 @@ def search_papers():
 def get_paper(paper_id):
     """Get specific paper by ID."""
     try:
-        arxiv_service = ArxivService()
+        arxiv_service = get_service(ArxivService)
         paper = arxiv_service.get_paper_by_id(paper_id)
         
         if not paper:
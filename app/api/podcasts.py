@@ -10,6 +10,7 @@ from datetime import datetime
 from .. import db, celery
 from ..models import User, Podcast, GenerationTask
 from ..services.storage_service import StorageService
+from ..services import get_service
 from ..api.errors import error_response
 from ..tasks.podcast_tasks import generate_podcast_script, generate_podcast_audio
 
@@ -90,7 +91,8 @@ def create_podcast():
             task_id=task_id,
             podcast_id=podcast.id,
             use_preferences=data['use_preferences'],
-            paper_ids=data['paper_ids']
+            paper_ids=data['paper_ids'],
+            task_pk=task.id
         )
         
         # Update task with celery task id
@@ -254,7 +256,7 @@ def get_podcast_audio(podcast_id):
         current_app.logger.info(f"Downloading from: {audio_file_url}")
         
         # Download from Google Cloud Storage
-        storage_service = StorageService()
+        storage_service = get_service(StorageService)
         local_file_path = storage_service.download_audio(audio_file_url)
         
         # Read the file and return it
@@ -310,7 +312,8 @@ def regenerate_audio(podcast_id):
         
         celery_task_object = generate_podcast_audio.delay(
             task_id=task_id,
-            podcast_id=podcast_id
+            podcast_id=podcast_id,
+            task_pk=task.id
         )
         
         db.session.refresh(task)
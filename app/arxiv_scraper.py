@@ -12,15 +12,26 @@ Features:
 - Error handling and logging
 """
 
-import arxiv
+import asyncio
+import collections
+import hashlib
+import io
+import json
+import math
+import os
+import tempfile
+import threading
 import time
 import logging
 import datetime
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
-from urllib.error import HTTPError
+import functools
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from dataclasses import dataclass, replace
 import random
 
+import aiohttp
+from lxml import etree
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,15 +39,109 @@ logging.basicConfig(
 )
 logger = logging.getLogger("arxiv_scraper")
 
-@dataclass
+# XML namespaces used by the arXiv Atom feed
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+
+@dataclass(frozen=True)
 class UserPreferences:
-    """Store user preferences for paper searches."""
-    topics: List[str]
-    categories: List[str] = None
-    authors: List[str] = None
+    """
+    Store user preferences for paper searches.
+    
+    Immutable and hashable so the built query can be cached; use
+    dataclasses.replace() to derive changed preferences.
+    """
+    topics: Tuple[str, ...]
+    categories: Optional[Tuple[str, ...]] = None
+    authors: Optional[Tuple[str, ...]] = None
     max_results: int = 50
     days_back: int = 30
     sort_by: str = "relevance"  # 'relevance' or 'lastUpdatedDate'
+    
+    def __post_init__(self):
+        # Accept any iterable (callers usually pass lists) but store tuples
+        for field_name in ("topics", "categories", "authors"):
+            value = getattr(self, field_name)
+            if value is not None and not isinstance(value, tuple):
+                object.__setattr__(self, field_name, tuple(value))
+
+
+@functools.lru_cache(maxsize=32)
+def _build_query(topics: Tuple[str, ...], categories: Optional[Tuple[str, ...]],
+                 authors: Optional[Tuple[str, ...]], days_back: int,
+                 today: datetime.date) -> str:
+    """
+    Build an arXiv API search query.
+    
+    The date is passed in rather than read here so cached queries stay
+    valid for the rest of the day and no longer.
+    
+    Returns:
+        str: arXiv API compatible search query
+    """
+    # Build topic query
+    topic_query = " OR ".join([f"all:{topic}" for topic in topics])
+    
+    # Add categories if specified
+    category_filter = ""
+    if categories:
+        category_filter = " AND (" + " OR ".join([f"cat:{cat}" for cat in categories]) + ")"
+    
+    # Add authors if specified
+    author_filter = ""
+    if authors:
+        author_filter = " AND (" + " OR ".join([f"au:\"{author}\"" for author in authors]) + ")"
+    
+    # Add date filter
+    date_filter = ""
+    if days_back > 0:
+        cutoff_date = today - datetime.timedelta(days=days_back)
+        date_str = cutoff_date.strftime("%Y%m%d")
+        date_filter = f" AND submittedDate:[{date_str}000000 TO 99991231235959]"
+    
+    # Combine all parts
+    return f"({topic_query}){category_filter}{author_filter}{date_filter}"
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for outbound API requests.
+    
+    Thread-safe, so a single bucket can gate scrapers running on different
+    threads and event loops.
+    """
+    
+    def __init__(self, rate: float = 1.0, capacity: int = 1):
+        """
+        Initialize the bucket full.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens that can accumulate
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens may go negative: each waiter reserves the next free slot
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
 
 
 class ArXivScraper:
@@ -46,12 +151,26 @@ class ArXivScraper:
     """
     
     # arXiv API base URL
-    BASE_URL = "http://export.arxiv.org/api/query"
+    BASE_URL = "https://export.arxiv.org/api/query"
     
     # arXiv API rate limits
     # See: https://arxiv.org/help/api/user-manual#dos
     MAX_REQUESTS_PER_SECOND = 1
     
+    # Shared by every scraper in the process so the limit holds globally
+    RATE_LIMITER = TokenBucket(rate=MAX_REQUESTS_PER_SECOND, capacity=1)
+    
+    # Results per API page and how many pages may be in flight at once
+    PAGE_SIZE = 100
+    MAX_CONCURRENT_PAGES = 4
+    
+    # arXiv asks API clients to identify themselves
+    USER_AGENT = "fionntan/1.0 (+https://github.com/farrencc/fionntan)"
+    
+    # arXiv publishes new listings once a day, so search results are cached on disk for 24h
+    CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fionntan", "arxiv")
+    CACHE_TTL_SECONDS = 24 * 60 * 60
+    
     def __init__(self, user_prefs: UserPreferences):
         """
         Initialize the ArXiv scraper with user preferences.
@@ -60,11 +179,45 @@ class ArXivScraper:
             user_prefs: UserPreferences object containing search parameters
         """
         self.user_prefs = user_prefs
-        self.client = arxiv.Client(
-            page_size=100,
-            delay_seconds=1,  # Respect arXiv's rate limits
-            num_retries=3
-        )
+        
+        # One pooled HTTP session (and the event loop it is bound to) is kept for
+        # the scraper's lifetime so later requests reuse open keep-alive connections
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Caps in-flight page requests across every search sharing the session
+        self._page_semaphore: Optional[asyncio.Semaphore] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.MAX_CONCURRENT_PAGES * 2,
+                limit_per_host=self.MAX_CONCURRENT_PAGES
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": self.USER_AGENT, "Connection": "keep-alive"}
+            )
+            self._page_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PAGES)
+        return self._session
+    
+    def _run(self, coro):
+        """Run a coroutine to completion on the scraper's own event loop."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+    
+    def close(self) -> None:
+        """Close the shared HTTP session and its event loop."""
+        if self._loop is None:
+            return
+        if self._session is not None and not self._session.closed:
+            self._loop.run_until_complete(self._session.close())
+        self._loop.close()
+        self._loop = None
+        self._session = None
+        self._page_semaphore = None
         
     def _build_search_query(self) -> str:
         """
@@ -73,124 +226,444 @@ class ArXivScraper:
         Returns:
             str: arXiv API compatible search query
         """
-        # Build topic query
-        topic_query = " OR ".join([f"all:{topic}" for topic in self.user_prefs.topics])
-        
-        # Add categories if specified
-        category_filter = ""
-        if self.user_prefs.categories:
-            category_filter = " AND (" + " OR ".join([f"cat:{cat}" for cat in self.user_prefs.categories]) + ")"
-        
-        # Add authors if specified
-        author_filter = ""
-        if self.user_prefs.authors:
-            author_filter = " AND (" + " OR ".join([f"au:\"{author}\"" for author in self.user_prefs.authors]) + ")"
-        
-        # Add date filter
-        date_filter = ""
-        if self.user_prefs.days_back > 0:
-            cutoff_date = datetime.datetime.now() - datetime.timedelta(days=self.user_prefs.days_back)
-            date_str = cutoff_date.strftime("%Y%m%d")
-            date_filter = f" AND submittedDate:[{date_str}000000 TO 99991231235959]"
-        
-        # Combine all parts
-        query = f"({topic_query}){category_filter}{author_filter}{date_filter}"
+        prefs = self.user_prefs
+        query = _build_query(
+            prefs.topics, prefs.categories, prefs.authors, prefs.days_back,
+            datetime.date.today()
+        )
         logger.info(f"Search query: {query}")
         return query
 
-    def search_papers(self) -> List[Dict[str, Any]]:
+    def search_papers(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Search for papers based on user preferences.
         
+        Args:
+            force_refresh: Skip the on-disk cache and query arXiv directly
+        
         Returns:
             List[Dict]: List of paper metadata dictionaries
         """
+        return list(self.iter_papers(force_refresh=force_refresh))
+
+    def iter_papers(self, force_refresh: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Yield papers matching user preferences as each result page arrives.
+        
+        Only a few pages are fetched ahead of the consumer, so stopping early
+        (e.g. with itertools.islice) never requests the remaining pages.
+        Results are served from the on-disk cache when an identical search
+        ran recently, and cached once the search has been read to the end.
+        
+        Args:
+            force_refresh: Skip the on-disk cache and query arXiv directly
+        
+        Yields:
+            Dict: Paper metadata, in result order
+        """
         query = self._build_search_query()
+        cache_path = self._cache_path(query)
+        
+        papers = self._load_cached(cache_path, force_refresh)
+        if papers is not None:
+            yield from papers
+            return
         
         try:
-            # Create search parameters
-            search = arxiv.Search(
-                query=query,
-                max_results=self.user_prefs.max_results,
-                sort_by=arxiv.SortCriterion.SubmittedDate if self.user_prefs.sort_by == "lastUpdatedDate" 
-                      else arxiv.SortCriterion.Relevance
-            )
+            yield from self._collect_results(cache_path, self._iter_pages(query))
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"HTTP error during search: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error during search: {e}")
+            raise
+
+    def _iter_pages(self, query: str) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield result pages in order, keeping a few requests in flight ahead.
+        
+        A page shorter than requested means the results are exhausted, so
+        no further pages are requested after it.
+        
+        Args:
+            query: arXiv API compatible search query
             
-            # Execute search with rate limiting
-            papers = []
-            for result in self.client.results(search):
-                papers.append(self._process_paper(result))
-                
-            logger.info(f"Found {len(papers)} papers matching the criteria")
+        Yields:
+            List[Dict]: Paper metadata for each page
+        """
+        max_results = self.user_prefs.max_results
+        session = self._run(self._get_session())
+        starts = iter(range(0, max_results, self.PAGE_SIZE))
+        pending = collections.deque()
+        
+        def schedule_next():
+            start = next(starts, None)
+            if start is not None:
+                page_size = min(self.PAGE_SIZE, max_results - start)
+                task = self._loop.create_task(self._fetch_page(
+                    session,
+                    self._page_semaphore,
+                    query,
+                    start=start,
+                    page_size=page_size
+                ))
+                pending.append((task, page_size))
+        
+        for _ in range(self.MAX_CONCURRENT_PAGES):
+            schedule_next()
+        
+        try:
+            while pending:
+                task, page_size = pending.popleft()
+                page = self._loop.run_until_complete(task)
+                if len(page) < page_size:
+                    yield page
+                    return
+                schedule_next()
+                yield page
+        finally:
+            # Cancel read-ahead pages once results run out, the consumer stops early or a page fails
+            tasks = [task for task, _ in pending]
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+    @staticmethod
+    def _unique_papers(pages: Iterable[List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Flatten result pages, keeping only the first occurrence of each paper.
+        
+        Results can shift between pages while they are fetched, so the same
+        paper may show up on two pages.
+        """
+        seen_ids = set()
+        for page in pages:
+            for paper in page:
+                paper_id = paper["id"].rsplit("v", 1)[0]  # Ignore the version suffix
+                if paper_id in seen_ids:
+                    continue
+                seen_ids.add(paper_id)
+                yield paper
+
+    async def search_papers_async(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Search for papers based on user preferences.
+        
+        All result pages are requested concurrently, so a large max_results
+        costs roughly one round trip instead of one per page. Results are
+        served from the on-disk cache when an identical search ran recently.
+        
+        Args:
+            force_refresh: Skip the on-disk cache and query arXiv directly
+        
+        Returns:
+            List[Dict]: List of paper metadata dictionaries
+        """
+        query = self._build_search_query()
+        cache_path = self._cache_path(query)
+        
+        papers = self._load_cached(cache_path, force_refresh)
+        if papers is not None:
             return papers
-            
-        except HTTPError as e:
+        
+        try:
+            pages = await self._fetch_all_pages(query)
+            return list(self._collect_results(cache_path, pages))
+        except aiohttp.ClientResponseError as e:
             logger.error(f"HTTP error during search: {e}")
-            if e.code == 429:  # Too Many Requests
-                logger.warning("Rate limit hit, implementing exponential backoff")
-                self._handle_rate_limit()
-                return self.search_papers()  # Retry after backoff
             raise
         except Exception as e:
             logger.error(f"Error during search: {e}")
             raise
 
-    def _process_paper(self, paper) -> Dict[str, Any]:
+    async def _fetch_all_pages(self, query: str) -> List[List[Dict[str, Any]]]:
+        """
+        Fetch every result page for a query concurrently.
+        
+        Args:
+            query: arXiv API compatible search query
+            
+        Returns:
+            List[List[Dict]]: Paper metadata for each page, in result order
+        """
+        max_results = self.user_prefs.max_results
+        pages = math.ceil(max_results / self.PAGE_SIZE)
+        session = await self._get_session()
+        
+        tasks = [
+            self._fetch_page(
+                session,
+                self._page_semaphore,
+                query,
+                start=i * self.PAGE_SIZE,
+                page_size=min(self.PAGE_SIZE, max_results - i * self.PAGE_SIZE)
+            )
+            for i in range(pages)
+        ]
+        # Pages come back in request order, so the sort order is preserved
+        return await asyncio.gather(*tasks)
+
+    def _load_cached(self, cache_path: str, force_refresh: bool) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached results for a search unless a refresh was forced."""
+        if force_refresh:
+            return None
+        papers = self._read_cache(cache_path)
+        if papers is not None:
+            logger.info(f"Loaded {len(papers)} papers from cache")
+        return papers
+
+    def _collect_results(self, cache_path: str, pages: Iterable[List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
         """
-        Process a paper result into a structured dictionary.
+        Deduplicate result pages and stream them into the cache.
+        
+        Both the streaming and the concurrent search end here, so they cache
+        results the same way.
+        """
+        count = 0
+        for paper in self._cache_through(cache_path, self._unique_papers(pages)):
+            count += 1
+            yield paper
+        logger.info(f"Found {count} papers matching the criteria")
+
+    def _cache_path(self, query: str) -> str:
+        """
+        Get the cache file path for a search.
         
         Args:
-            paper: arXiv result object
+            query: arXiv API compatible search query
             
         Returns:
-            Dict: Structured paper metadata
-        """
-        return {
-            "id": paper.entry_id.split("/")[-1],
-            "title": paper.title,
-            "authors": [author.name for author in paper.authors],
-            "abstract": paper.summary,
-            "pdf_url": paper.pdf_url,
-            "categories": paper.categories,
-            "published": paper.published.strftime("%Y-%m-%d"),
-            "updated": paper.updated.strftime("%Y-%m-%d"),
-            "url": paper.entry_id,
-            "comment": paper.comment
+            str: Path of the JSON cache file
+        """
+        # Result count and ordering change the response, so they are part of the key
+        key_source = f"{query}|{self.user_prefs.max_results}|{self.user_prefs.sort_by}"
+        key = hashlib.sha1(key_source.encode("utf-8")).hexdigest()
+        return os.path.join(self.CACHE_DIR, f"{key}.json")
+
+    def _read_cache(self, path: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached papers if the cache file exists and is still fresh; expired files are deleted."""
+        try:
+            if time.time() - os.path.getmtime(path) >= self.CACHE_TTL_SECONDS:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _prune_cache(self) -> None:
+        """
+        Delete every expired cache file.
+        
+        Queries embed the day's date cutoff, so yesterday's entries are never
+        read again and would otherwise pile up.
+        """
+        try:
+            cutoff = time.time() - self.CACHE_TTL_SECONDS
+            with os.scandir(self.CACHE_DIR) as entries:
+                for entry in entries:
+                    # Also catches temporary files left by a crashed write
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        try:
+                            os.remove(entry.path)
+                        except FileNotFoundError:
+                            pass
+        except OSError as e:
+            logger.warning(f"Could not prune search cache: {e}")
+
+    def _cache_through(self, path: str, papers: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield papers unchanged while streaming them into the cache.
+        
+        The cache file is only replaced once every paper has been consumed,
+        so an abandoned or failed search never leaves a partial result behind.
+        """
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.CACHE_DIR, suffix=".tmp")
+        except OSError as e:
+            logger.warning(f"Could not write search cache: {e}")
+            yield from papers
+            return
+        
+        completed = False
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("[")
+                for i, paper in enumerate(papers):
+                    if i:
+                        f.write(",")
+                    json.dump(paper, f)
+                    yield paper
+                f.write("]")
+            os.replace(tmp_path, path)
+            completed = True
+            self._prune_cache()
+        finally:
+            if not completed:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    async def _fetch_page(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                          query: str, start: int, page_size: int) -> List[Dict[str, Any]]:
+        """
+        Fetch and parse a single page of search results.
+        
+        Args:
+            session: HTTP session shared by all pages of the search
+            semaphore: Limits how many pages are requested at once
+            query: arXiv API compatible search query
+            start: Offset of the first result on this page
+            page_size: Number of results to request
+            
+        Returns:
+            List[Dict]: Paper metadata for this page
+        """
+        params = {
+            "search_query": query,
+            "start": start,
+            "max_results": page_size,
+            "sortBy": "submittedDate" if self.user_prefs.sort_by == "lastUpdatedDate" else "relevance",
+            "sortOrder": "descending"
         }
+        
+        retries = 0
+        while True:
+            try:
+                async with semaphore:
+                    await self.RATE_LIMITER.acquire()
+                    async with session.get(self.BASE_URL, params=params, raise_for_status=True) as response:
+                        body = await response.read()
+                break
+            except aiohttp.ClientResponseError as e:
+                if e.status != 429:  # Only Too Many Requests is retried
+                    raise
+                retries += 1
+                logger.warning("Rate limit hit, implementing exponential backoff")
+                await self._handle_rate_limit(retries)
+        
+        return self._parse_feed(body)
+
+    def _parse_feed(self, body: bytes) -> List[Dict[str, Any]]:
+        """
+        Parse an Atom feed page into structured dictionaries.
+        
+        Entries are streamed and freed one at a time, and only the fields
+        we keep are read.
+        
+        Args:
+            body: Raw Atom XML returned by the API
+            
+        Returns:
+            List[Dict]: Structured paper metadata
+        """
+        papers = []
+        for _, entry in etree.iterparse(io.BytesIO(body), tag=f"{ATOM_NS}entry"):
+            url = title = abstract = published = updated = pdf_url = comment = None
+            authors = []
+            categories = []
+            
+            for child in entry:
+                tag = child.tag
+                if tag == f"{ATOM_NS}id":
+                    url = child.text
+                elif tag == f"{ATOM_NS}title":
+                    title = " ".join((child.text or "").split())
+                elif tag == f"{ATOM_NS}summary":
+                    abstract = (child.text or "").strip()
+                elif tag == f"{ATOM_NS}published":
+                    published = child.text[:10]
+                elif tag == f"{ATOM_NS}updated":
+                    updated = child.text[:10]
+                elif tag == f"{ATOM_NS}author":
+                    authors.append(child.findtext(f"{ATOM_NS}name"))
+                elif tag == f"{ATOM_NS}category":
+                    categories.append(child.get("term"))
+                elif tag == f"{ATOM_NS}link" and child.get("title") == "pdf":
+                    pdf_url = child.get("href")
+                elif tag == f"{ARXIV_NS}comment":
+                    comment = child.text
+            
+            papers.append({
+                "id": url.split("/")[-1],
+                "title": title,
+                "authors": authors,
+                "abstract": abstract,
+                "pdf_url": pdf_url,
+                "categories": categories,
+                "published": published,
+                "updated": updated,
+                "url": url,
+                "comment": comment
+            })
+            entry.clear()
+        
+        return papers
     
-    def _handle_rate_limit(self) -> None:
-        """Handle rate limiting with exponential backoff."""
-        # Start with a 1-second delay, then increase exponentially
+    async def _handle_rate_limit(self, retries: int) -> None:
+        """
+        Back off after a rate-limited request.
+        
+        Uses "full jitter": the wait is drawn uniformly from the whole backoff
+        window, so concurrent workers spread their retries out instead of
+        hitting arXiv again in lockstep. The retried request itself shows
+        whether the limit has lifted.
+        
+        Args:
+            retries: Number of rate-limited attempts so far (1-based)
+        """
+        # Start with a 1-second window, then double it up to 1 minute
         base_delay = 1
-        max_delay = 60  # Maximum 1 minute delay
-        retries = 0
+        max_delay = 60
         max_retries = 5
         
-        while retries < max_retries:
-            retries += 1
-            # Calculate delay with jitter
-            delay = min(max_delay, base_delay * (2 ** retries))
-            jitter = random.uniform(0, 0.1 * delay)
-            total_delay = delay + jitter
-            
-            logger.warning(f"Rate limit backoff: waiting {total_delay:.2f} seconds (retry {retries}/{max_retries})")
-            time.sleep(total_delay)
+        if retries > max_retries:
+            logger.error("Rate limit backoff failed after maximum retries")
+            raise Exception("Rate limiting could not be resolved after multiple retries")
+        
+        total_delay = random.uniform(0, min(max_delay, base_delay * (2 ** retries)))
+        
+        logger.warning(f"Rate limit backoff: waiting {total_delay:.2f} seconds (retry {retries}/{max_retries})")
+        await asyncio.sleep(total_delay)
+
+    def _batch_preferences(self, topics: List[str], categories: Optional[List[str]] = None,
+                           authors: Optional[List[str]] = None) -> UserPreferences:
+        """Derive preferences for a batch from the scraper's own preferences."""
+        changes = {"topics": topics}
+        if categories:
+            changes["categories"] = categories
+        if authors:
+            changes["authors"] = authors
+        return replace(self.user_prefs, **changes)
+
+    async def download_batches(self, specs: List[Tuple[List[str], Optional[List[str]], Optional[List[str]]]]
+                               ) -> List[List[Dict[str, Any]]]:
+        """
+        Download several batches of papers concurrently.
+        
+        Every batch shares this scraper's HTTP session and page limit, and
+        the class-wide rate limiter, so running many batches at once still
+        respects arXiv's limits.
+        
+        Args:
+            specs: (topics, categories, authors) tuples, one per batch
             
-            # Try a simple request to see if we're still rate limited
-            try:
-                # Make a minimal test request
-                test_search = arxiv.Search(query="test", max_results=1)
-                next(self.client.results(test_search))
-                logger.info("Rate limit backoff successful")
-                return  # We're good to go
-            except HTTPError as e:
-                if e.code != 429:  # If it's not a rate limit issue, raise
-                    raise
-                # Otherwise continue with backoff
+        Returns:
+            List[List[Dict]]: Paper metadata for each batch, in spec order
+        """
+        session = await self._get_session()
+        
+        views = []
+        for topics, categories, authors in specs:
+            view = ArXivScraper(self._batch_preferences(topics, categories, authors))
+            view._session = session
+            view._page_semaphore = self._page_semaphore
+            views.append(view)
         
-        # If we've exhausted retries
-        logger.error("Rate limit backoff failed after maximum retries")
-        raise Exception("Rate limiting could not be resolved after multiple retries")
+        return await asyncio.gather(*[view.search_papers_async() for view in views])
 
     def download_batch(self, topics: List[str], categories: Optional[List[str]] = None, 
                        authors: Optional[List[str]] = None) -> List[Dict[str, Any]]:
@@ -205,15 +678,11 @@ class ArXivScraper:
         Returns:
             List[Dict]: List of paper metadata dictionaries
         """
-        # Update preferences
-        self.user_prefs.topics = topics
-        if categories:
-            self.user_prefs.categories = categories
-        if authors:
-            self.user_prefs.authors = authors
-            
-        return self.search_papers()
-
+        papers, = self._run(self.download_batches([(topics, categories, authors)]))
+        
+        # Keep the updated preferences, as before
+        self.user_prefs = self._batch_preferences(topics, categories, authors)
+        return papers
 
 def main():
     """Example usage of the ArXivScraper class."""
@@ -244,6 +713,8 @@ def main():
             print(f"URL: {paper['url']}")
     except Exception as e:
         logger.error(f"Error in main: {e}")
+    finally:
+        scraper.close()
 
 
 if __name__ == "__main__":
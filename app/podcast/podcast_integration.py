@@ -10,6 +10,7 @@ import logging
 import json
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from dataclasses import replace
 import os
 
 # Import the arXiv scraper module and Gemini podcast generator
@@ -91,13 +92,16 @@ class PodcastCreator:
             max_papers = 5
             if arxiv_prefs.max_results > max_papers:
                 logger.info(f"Limiting max_results from {arxiv_prefs.max_results} to {max_papers} for podcast generation")
-                arxiv_prefs.max_results = max_papers
+                arxiv_prefs = replace(arxiv_prefs, max_results=max_papers)
             
             # Create arXiv scraper
             scraper = ArXivScraper(arxiv_prefs)
             
             # Fetch papers based on preferences
-            papers = scraper.search_papers()
+            try:
+                papers = scraper.search_papers()
+            finally:
+                scraper.close()
             
             if not papers:
                 logger.warning("No papers found matching the given preferences")
@@ -182,7 +186,10 @@ class PodcastCreator:
                 search = query
                 
                 # Use the search method but with our custom query
-                paper_results = scraper.search_papers()
+                try:
+                    paper_results = scraper.search_papers()
+                finally:
+                    scraper.close()
                 
                 if paper_results:
                     papers.extend(paper_results)
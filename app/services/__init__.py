@@ -1,5 +1,7 @@
 # app/services/__init__.py
 
+from flask import current_app
+
 # Import all service classes to make them easily accessible
 from .storage_service import StorageService
 from .arxiv_service import ArxivService
@@ -11,5 +13,27 @@ __all__ = [
     'StorageService',
     'ArxivService', 
     'GeminiService',
-    'TTSService'
-]
\ No newline at end of file
+    'TTSService',
+    'get_service',
+    'preload_services'
+]
+
+
+def get_service(service_cls):
+    """Return the app's shared instance of a service, creating it on first use."""
+    services = current_app.extensions.setdefault('services', {})
+    service = services.get(service_cls)
+    if service is None:
+        service = service_cls()
+        services[service_cls] = service
+    return service
+
+
+def preload_services(app):
+    """Create the shared service instances up front so the first request skips client setup."""
+    with app.app_context():
+        for service_cls in (ArxivService, GeminiService, TTSService, StorageService):
+            try:
+                get_service(service_cls)
+            except Exception as e:
+                app.logger.warning(f"Could not preload {service_cls.__name__}: {str(e)}")
\ No newline at end of file
@@ -1,27 +1,187 @@
 # app/services/arxiv_service.py
 
-import arxiv
+import asyncio
+import hashlib
+import io
+import itertools
+import json
 import logging
+import threading
 import time # Required for time.sleep
 import random # Required for jitter
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import urllib.error # For specifically catching HTTPError
+import urllib.parse
+
+import aiohttp
+import requests
+from flask import current_app, has_app_context
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .disk_cache import DiskCache
 
 logger = logging.getLogger(__name__)
 
+# Atom API endpoint; also probed with HEAD requests to check whether a rate limit has lifted
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+
+# Map user sort preferences onto API sort keys; anything else sorts by relevance
+_API_SORT_BY = {
+    "lastUpdatedDate": "lastUpdatedDate",
+    "submittedDate": "submittedDate",
+}
+
+# Most connections one search keeps open to arXiv at once
+_CONNECTION_LIMIT = 10
+
+# A slow page fails on its own instead of holding up the whole search
+_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=5)
+
+# XML namespaces used by the arXiv Atom feed
+_FEED_NS = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+
+def _feed_xpath(path: str) -> etree.XPath:
+    """Compile an XPath over the Atom feed; plain strings don't keep the parsed tree alive."""
+    return etree.XPath(path, namespaces=_FEED_NS, smart_strings=False)
+
+# Compiled once so parsing a feed runs each field lookup inside libxml2
+_X_ENTRIES = _feed_xpath("/atom:feed/atom:entry")
+_X_ID = _feed_xpath("string(atom:id)")
+_X_TITLE = _feed_xpath("normalize-space(atom:title)")
+_X_AUTHORS = _feed_xpath("atom:author/atom:name/text()")
+_X_SUMMARY = _feed_xpath("string(atom:summary)")
+_X_PDF_URL = _feed_xpath("string(atom:link[@title='pdf']/@href)")
+_X_CATEGORIES = _feed_xpath("atom:category/@term")
+_X_PUBLISHED = _feed_xpath("substring(atom:published, 1, 10)")
+_X_UPDATED = _feed_xpath("substring(atom:updated, 1, 10)")
+_X_COMMENT = _feed_xpath("arxiv:comment/text()")
+_X_PRIMARY_CATEGORY = _feed_xpath("string(arxiv:primary_category/@term)")
+
+# OAI-PMH endpoint for bulk metadata harvesting, and the namespaces of its
+# envelope and of the arXiv metadata format
+ARXIV_OAI_URL = "http://export.arxiv.org/oai2"
+_OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+_OAI_ARXIV_NS = "{http://arxiv.org/OAI/arXiv/}"
+
+@dataclass(frozen=True)
+class _OaiAuthor:
+    name: str
+
+@dataclass(frozen=True)
+class _OaiRecord:
+    """Exposes an OAI-PMH arXiv record through the attributes _process_paper reads."""
+    entry_id: str
+    title: str
+    summary: str
+    authors: Tuple[_OaiAuthor, ...]
+    categories: List[str]
+    pdf_url: str
+    published: datetime
+    updated: datetime
+    comment: Optional[str]
+    primary_category: Optional[str]
+
+    def get_short_id(self) -> str:
+        return self.entry_id.rpartition("/abs/")[2]
+
+# Submission-date filter, filled in with the cutoff as YYYYMMDD
+_DATE_RANGE_TEMPLATE = "submittedDate:[{}000000 TO 99991231235959]"
+
+@lru_cache(maxsize=256)
+def _cached_query(
+    topics: Tuple[str, ...],
+    categories: Tuple[str, ...],
+    authors: Tuple[str, ...],
+    days_back: int,
+    day_iso: str
+) -> str:
+    """Build a search query string for the given filters as of day_iso."""
+    parts = []
+    if topics:
+        topic_query = " OR ".join([f"all:{topic.strip()}" for topic in topics if topic.strip()])
+        if topic_query: parts.append(f"({topic_query})")
+    if categories:
+        category_query = " OR ".join([f"cat:{cat.strip()}" for cat in categories if cat.strip()])
+        if category_query: parts.append(f"({category_query})")
+    if authors:
+        author_query = " OR ".join([f"au:\"{author.strip()}\"" for author in authors if author.strip()])
+        if author_query: parts.append(f"({author_query})")
+
+    # Append date filter if applicable; on its own it is the whole query
+    if days_back > 0:
+        cutoff_date = date.fromisoformat(day_iso) - timedelta(days=days_back)
+        parts.append(_DATE_RANGE_TEMPLATE.format(cutoff_date.strftime("%Y%m%d")))
+
+    return " AND ".join(parts) if parts else "all:*" # Default if no criteria
+
+class _RequestPacer:
+    """
+    Spaces out the start of requests by at least `interval` seconds.
+    
+    Thread-safe, so one pacer can gate calls running on different threads
+    (or greenlets) and event loops.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    async def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
 class ArxivService:
     """Service for interacting with ArXiv API."""
 
+    # Results requested per Atom page
+    PAGE_SIZE = 100
+
+    # Pages of one search that may be in flight at once
+    MAX_CONCURRENT_PAGES = 3
+
+    # Minimum gap between request starts, in seconds
+    REQUEST_INTERVAL = 1
+
+    # Shared by every call in the process so the interval holds globally
+    RATE_LIMITER = _RequestPacer(REQUEST_INTERVAL)
+
+    USER_AGENT = "fionntan/1.0"
+
+    # Large collaborations list hundreds of authors, so names are read in C
+    _author_name = attrgetter("name")
+
     def __init__(self):
         """Initialize ArXiv service."""
-        self.client = arxiv.Client(
-            page_size=100,
-            delay_seconds=1,
-            num_retries=0
-        )
         self.rate_limit_max_retries_internal = 2
         self.rate_limit_base_delay = 1  # seconds for custom backoff
+        self.session = requests.Session()
+
+        # Feeds are cached on disk only inside the app; scripts fetch fresh
+        config = current_app.config if has_app_context() else {}
+        self.cache = DiskCache(
+            config.get('ARXIV_CACHE_DIR'),
+            config.get('ARXIV_CACHE_MAX_BYTES', 256 * 1024 ** 2),
+            suffix='.feed',
+            name='arXiv'
+        )
+
+        # OAI-PMH asks harvesters to back off with 503 + Retry-After, which
+        # urllib3 honours; kept apart from the probe session, which must see 429s
+        self.oai_session = requests.Session()
+        retry = Retry(total=5, backoff_factor=2, status_forcelist=[429, 503])
+        self.oai_session.mount("http://", HTTPAdapter(max_retries=retry))
+        self.oai_session.mount("https://", HTTPAdapter(max_retries=retry))
 
     def _build_search_query(
         self,
@@ -31,65 +191,46 @@ class ArxivService:
         days_back: int = 30
     ) -> str:
         """Build a search query string."""
-        main_query_parts = []
-        if topics:
-            topic_query = " OR ".join([f"all:{topic.strip()}" for topic in topics if topic.strip()])
-            if topic_query: main_query_parts.append(f"({topic_query})")
-        if categories:
-            category_query = " OR ".join([f"cat:{cat.strip()}" for cat in categories if cat.strip()])
-            if category_query: main_query_parts.append(f"({category_query})")
-        if authors:
-            author_query = " OR ".join([f"au:\"{author.strip()}\"" for author in authors if author.strip()])
-            if author_query: main_query_parts.append(f"({author_query})")
-
-        # Build the base of the query
-        if main_query_parts:
-            query = " AND ".join(main_query_parts)
-        else:
-            query = "all:*" # Default if no main criteria
-
-        # Append date filter if applicable
-        if days_back > 0:
-            cutoff_date = datetime.now() - timedelta(days=days_back)
-            date_str = cutoff_date.strftime("%Y%m%d")
-            date_query_part = f"submittedDate:[{date_str}000000 TO 99991231235959]"
-            if query == "all:*": # If only date filter is active
-                query = date_query_part
-            else:
-                query += f" AND {date_query_part}"
-
+        # Queries only change by day, so the cache key uses today's date. The
+        # terms are ORed together, so sorting them lets any ordering share an entry
+        query = _cached_query(
+            tuple(sorted(topics or ())),
+            tuple(sorted(categories or ())),
+            tuple(sorted(authors or ())),
+            days_back,
+            date.today().isoformat()
+        )
         logger.info(f"Constructed arXiv query: {query}")
         return query
 
-    def _handle_rate_limit_internally(self) -> None:
+    async def _handle_rate_limit_internally(self) -> None:
         """
-        Internal handler for rate limiting with exponential backoff and test pings.
-        This is called when a 429 is detected by search_papers or get_paper_by_id.
+        Internal handler for rate limiting with exponential backoff and HEAD probes.
+        This is awaited when a 429 is detected by search_papers or get_paper_by_id,
+        so other pages of the search keep running while it waits.
         """
         for i in range(self.rate_limit_max_retries_internal):
-            delay = (self.rate_limit_base_delay * (2**i)) + \
-                    random.uniform(0, 0.1 * (self.rate_limit_base_delay * (2**i)))
+            # Jitter of up to one base delay keeps concurrent pages from retrying in lockstep
+            delay = (self.rate_limit_base_delay * (2**i)) + random.uniform(0, self.rate_limit_base_delay)
             logger.warning(
                 f"Rate limit: backing off for {delay:.2f} seconds "
                 f"(internal attempt {i+1}/{self.rate_limit_max_retries_internal})."
             )
-            time.sleep(delay)
+            await asyncio.sleep(delay)
             try:
-                test_search = arxiv.Search(query="all:test", max_results=1)
-                next(self.client.results(test_search))
-                logger.info("Rate limit appears to be lifted after internal test ping.")
-                return # Success, rate limit lifted
-            except urllib.error.HTTPError as e_test:
-                if e_test.code == 429:
-                    logger.warning(f"Still rate-limited during internal ping (attempt {i+1}).")
+                # A HEAD request shows the rate-limit status without running a search
+                response = await asyncio.to_thread(self.session.head, ARXIV_API_URL, timeout=5)
+                if response.status_code == 429:
+                    logger.warning(f"Still rate-limited during internal probe (attempt {i+1}).")
                     # If this is the last retry and it still fails, the loop will end
                     # and the custom error below will be raised.
-                else:
-                    logger.error(f"Non-429 HTTPError during rate limit test ping: {e_test}")
-                    raise # Re-raise non-429 errors immediately
-            except Exception as e_exc:
-                logger.error(f"Unexpected error during rate limit test ping: {e_exc}")
-                raise # Re-raise other unexpected errors
+                    continue
+                response.raise_for_status()
+                logger.info("Rate limit appears to be lifted after internal probe.")
+                return # Success, rate limit lifted
+            except requests.RequestException as e_test:
+                logger.error(f"Error during rate limit probe: {e_test}")
+                raise # Re-raise non-429 errors immediately
         
         # If loop completes, all retries (including pings) failed to resolve 429
         logger.error("Max retries for internal rate limit handling reached and pings still failed.")
@@ -110,68 +251,293 @@ class ArxivService:
         sort_by_preference: str = "relevance"
     ) -> Tuple[List[Dict[str, Any]], int]:
         """Search ArXiv papers with filters and rate limit/connection error handling."""
+        # Topics and categories are ORed into one query, so preferences of any
+        # breadth cost only the pages max_results needs; those pages run at once
         query = self._build_search_query(topics, categories, authors, days_back)
+        logger.info(f"Searching arXiv, sort_by: {sort_by_preference}, max_results: {max_results}")
+
+        try:
+            return self._retry_with_backoff(lambda: asyncio.run(
+                self._search_papers_async(query, max_results, sort_by_preference)
+            ))
+        except Exception as e:
+            logger.error(f"Failed to search ArXiv after multiple retries: {str(e)}")
+            raise
+
+    async def _search_papers_async(
+        self,
+        query: str,
+        max_results: int,
+        sort_by_preference: str
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Fetch the result pages of a query concurrently and join them in order."""
+        sort_by = _API_SORT_BY.get(sort_by_preference, "relevance")
+        async with self._open_session() as session:
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PAGES)
 
-        if sort_by_preference == "lastUpdatedDate":
-            sort_criterion = arxiv.SortCriterion.LastUpdatedDate
-        elif sort_by_preference == "submittedDate":
-             sort_criterion = arxiv.SortCriterion.SubmittedDate
-        else:
-            sort_criterion = arxiv.SortCriterion.Relevance
+            async def fetch_page(start):
+                params = {
+                    "search_query": query,
+                    "start": start,
+                    "max_results": min(self.PAGE_SIZE, max_results - start),
+                    "sortBy": sort_by,
+                    "sortOrder": "descending"
+                }
+                async with semaphore:
+                    body = await self._fetch_feed_rate_limited(session, params)
+                return await asyncio.to_thread(self._parse_feed, body)
 
-        logger.info(f"Searching arXiv with query: '{query}', sort_by: {sort_criterion.value}, max_results: {max_results}")
+            pages = await asyncio.gather(
+                *(fetch_page(start) for start in range(0, max_results, self.PAGE_SIZE))
+            )
+
+        # Results can shift between pages while they are fetched, so the
+        # same paper may show up twice
+        papers = []
+        seen = set()
+        for paper in itertools.chain.from_iterable(pages):
+            if paper["id"] not in seen:
+                seen.add(paper["id"])
+                papers.append(paper)
+        return papers, len(papers)
 
-        search = arxiv.Search(
-            query=query,
-            max_results=max_results,
-            sort_by=sort_criterion,
-            sort_order=arxiv.SortOrder.Descending
+    def _open_session(self) -> aiohttp.ClientSession:
+        """
+        Open an HTTP session for one call; sessions are bound to the event loop they start on.
+        
+        Every page of the call goes through this session, so they reuse its
+        kept-alive connections rather than each paying for a TLS handshake.
+        """
+        connector = aiohttp.TCPConnector(limit=_CONNECTION_LIMIT)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=_REQUEST_TIMEOUT,
+            headers={"User-Agent": self.USER_AGENT}
         )
 
-        def _fetch():
-            results_iterable = self.client.results(search)
-            results_list = list(results_iterable)
-            papers = [self._process_paper(result) for result in results_list]
-            total = len(papers)
-            return papers, total
+    async def _fetch_feed(self, session: aiohttp.ClientSession, params: Dict[str, Any]) -> bytes:
+        """Fetch the raw Atom feed for one API query, revalidating a cached copy if there is one."""
+        cache_key = self._cache_key(params)
+        cached = self._read_cache(cache_key)
+        headers = {}
+        if cached:
+            validators, cached_body = cached
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
 
-        try:
-            return self._retry_with_backoff(_fetch)
-        except Exception as e:
-            logger.error(f"Failed to search ArXiv after multiple retries: {str(e)}")
-            raise
+        async with session.get(ARXIV_API_URL, params=params, headers=headers, raise_for_status=True) as response:
+            if response.status == 304 and cached:
+                return cached_body
+            body = await response.read()
+            self._write_cache(cache_key, body, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            return body
 
+    def _cache_key(self, params: Dict[str, Any]) -> str:
+        """Build the cache key for an API query from its normalised parameters."""
+        query = urllib.parse.urlencode(sorted(params.items()))
+        return hashlib.blake2b(query.encode('utf-8'), digest_size=20).hexdigest()
 
-    def get_paper_by_id(self, paper_id: str) -> Optional[Dict[str, Any]]:
-        """Get specific paper by ID with improved error handling."""
-        def _fetch_paper():
-            search = arxiv.Search(id_list=[paper_id])
-            results_iterable = self.client.results(search)
-            results_list = list(results_iterable)
-            if results_list:
-                return self._process_paper(results_list[0])
+    def _read_cache(self, cache_key: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """Return the cached validators and feed for a key, or None on a miss."""
+        entry = self.cache.get(cache_key)
+        if entry is None:
             return None
+        # Entries are one line of JSON validators followed by the feed
+        header, _, body = entry.partition(b"\n")
+        try:
+            return json.loads(header), body
+        except ValueError as e:
+            logger.warning(f"Error reading arXiv cache entry {cache_key}: {str(e)}")
+            return None
+
+    def _write_cache(self, cache_key: str, body: bytes, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Store a feed with its validators; feeds without validators can't be revalidated."""
+        if etag or last_modified:
+            header = json.dumps({"etag": etag, "last_modified": last_modified}).encode()
+            self.cache.set(cache_key, header + b"\n" + body)
+
+    async def _fetch_feed_rate_limited(self, session: aiohttp.ClientSession, params: Dict[str, Any]) -> bytes:
+        """Fetch a feed at the process-wide pace, waiting out a 429 once before trying again."""
+        try:
+            await self.RATE_LIMITER.wait()
+            return await self._fetch_feed(session, params)
+        except aiohttp.ClientResponseError as e:
+            if e.status != 429:
+                raise
+            # Waits until a probe shows the limit has lifted, or raises
+            await self._handle_rate_limit_internally()
+            await self.RATE_LIMITER.wait()
+            return await self._fetch_feed(session, params)
+
+    def _parse_feed(self, body: bytes) -> List[Dict[str, Any]]:
+        """Parse an Atom feed into paper dictionaries shaped like _process_paper's."""
+        papers = []
+        for entry in _X_ENTRIES(etree.fromstring(body)):
+            url = _X_ID(entry)
+            comment = _X_COMMENT(entry)
+            papers.append({
+                "id": url.rpartition("/abs/")[2],
+                "title": _X_TITLE(entry),
+                "authors": tuple(_X_AUTHORS(entry)),
+                "abstract": _X_SUMMARY(entry).strip(),
+                "pdf_url": _X_PDF_URL(entry) or None,
+                "categories": _X_CATEGORIES(entry),
+                "published": _X_PUBLISHED(entry),
+                "updated": _X_UPDATED(entry),
+                "url": url,
+                "comment": comment[0] if comment else None,
+                "primary_category": _X_PRIMARY_CATEGORY(entry) or None
+            })
+        return papers
+
+    def get_papers_by_ids(self, paper_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get several papers by ID in one request; IDs arXiv doesn't return are left out."""
+        if not paper_ids:
+            return []
+
+        async def _fetch(session, ids):
+            # Without max_results the API stops at 10 papers
+            params = {"id_list": ",".join(ids), "max_results": len(ids)}
+            body = await self._fetch_feed_rate_limited(session, params)
+            return self._parse_feed(body)
+
+        async def _fetch_papers():
+            async with self._open_session() as session:
+                try:
+                    return await _fetch(session, paper_ids)
+                except aiohttp.ClientResponseError as e:
+                    # One malformed ID makes arXiv reject the whole batch, so
+                    # fall back to one request per ID and drop only the bad ones
+                    if not 400 <= e.status < 500 or e.status == 429 or len(paper_ids) == 1:
+                        raise
+                    logger.warning(f"Batch lookup rejected ({e.status}); fetching papers one by one")
+
+                papers = []
+                for paper_id in paper_ids:
+                    try:
+                        papers.extend(await _fetch(session, [paper_id]))
+                    except aiohttp.ClientResponseError as e:
+                        if not 400 <= e.status < 500 or e.status == 429:
+                            raise
+                        logger.warning(f"Skipping paper {paper_id}: {str(e)}")
+                return papers
         
         try:
-            return self._retry_with_backoff(_fetch_paper)
+            return self._retry_with_backoff(lambda: asyncio.run(_fetch_papers()))
         except Exception as e:
-            logger.error(f"Error retrieving paper {paper_id}: {str(e)}")
-            return None  # Return None instead of raising to continue with other papers
+            logger.error(f"Error retrieving papers {', '.join(paper_ids)}: {str(e)}")
+            return []  # Return an empty list instead of raising so callers can fall back
+
+    def get_paper_by_id(self, paper_id: str) -> Optional[Dict[str, Any]]:
+        """Get specific paper by ID; prefer get_papers_by_ids when fetching several."""
+        papers = self.get_papers_by_ids([paper_id])
+        return papers[0] if papers else None
+
+    def _build_oai_request(
+        self,
+        from_date: date,
+        until_date: Optional[date] = None,
+        set_spec: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Build the query parameters for the first ListRecords request of a harvest."""
+        params = {
+            "verb": "ListRecords",
+            "metadataPrefix": "arXiv",
+            "from": from_date.isoformat()
+        }
+        if until_date:
+            params["until"] = until_date.isoformat()
+        if set_spec:
+            params["set"] = set_spec
+        return params
+
+    def harvest(
+        self,
+        from_date: date,
+        set_spec: Optional[str] = None,
+        until_date: Optional[date] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Harvest every record changed since from_date through OAI-PMH.
+        
+        Each response carries up to 1000 records plus a resumptionToken for
+        the next batch, so large date windows need no per-page queries.
+        Papers are yielded as they are parsed, in _process_paper's shape.
+        """
+        params = self._build_oai_request(from_date, until_date, set_spec)
+        while params:
+            try:
+                response = self.oai_session.get(ARXIV_OAI_URL, params=params, timeout=60)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                logger.error(f"Error harvesting arXiv records: {str(e)}")
+                raise
+
+            token = None
+            for _, element in etree.iterparse(
+                io.BytesIO(response.content),
+                tag=(f"{_OAI_NS}record", f"{_OAI_NS}resumptionToken", f"{_OAI_NS}error")
+            ):
+                if element.tag == f"{_OAI_NS}record":
+                    record = self._parse_oai_record(element)
+                    if record is not None:
+                        yield self._process_paper(record)
+                elif element.tag == f"{_OAI_NS}resumptionToken":
+                    token = element.text
+                elif element.get("code") != "noRecordsMatch":
+                    raise ValueError(f"OAI-PMH error {element.get('code')}: {element.text}")
+                element.clear()
+
+            # An empty token marks the last batch
+            params = {"verb": "ListRecords", "resumptionToken": token} if token else None
+
+    def _parse_oai_record(self, record) -> Optional[_OaiRecord]:
+        """Adapt an OAI-PMH arXiv record; deleted records have no metadata and are skipped."""
+        metadata = record.find(f"{_OAI_NS}metadata/{_OAI_ARXIV_NS}arXiv")
+        if metadata is None:
+            return None
+
+        def text(name):
+            value = metadata.findtext(f"{_OAI_ARXIV_NS}{name}")
+            return " ".join(value.split()) if value else None
+
+        paper_id = text("id")
+        categories = (text("categories") or "").split()
+        created = datetime.strptime(text("created"), "%Y-%m-%d")
+        updated = text("updated")
+        return _OaiRecord(
+            entry_id=f"http://arxiv.org/abs/{paper_id}",
+            title=text("title") or "",
+            summary=text("abstract") or "",
+            authors=tuple(
+                _OaiAuthor(" ".join(filter(None, (
+                    author.findtext(f"{_OAI_ARXIV_NS}forenames"),
+                    author.findtext(f"{_OAI_ARXIV_NS}keyname")
+                ))))
+                for author in metadata.iterfind(f"{_OAI_ARXIV_NS}authors/{_OAI_ARXIV_NS}author")
+            ),
+            categories=categories,
+            pdf_url=f"http://arxiv.org/pdf/{paper_id}",
+            published=created,
+            updated=datetime.strptime(updated, "%Y-%m-%d") if updated else created,
+            comment=text("comments"),
+            # The first listed category is the primary one
+            primary_category=categories[0] if categories else None
+        )
 
     def _retry_with_backoff(self, func, max_retries=3):
         """Retry function with exponential backoff for connection errors."""
         for attempt in range(max_retries):
             try:
                 return func()
-            except (ConnectionResetError, urllib.error.URLError, TimeoutError, arxiv.HTTPError) as e:
-                # Specific handling for Arxiv's 429 rate limit error
-                is_rate_limit = isinstance(e, arxiv.HTTPError) and e.status == 429
-                
-                # For non-rate-limit HTTP errors, don't retry.
-                if isinstance(e, arxiv.HTTPError) and not is_rate_limit:
-                    logger.error(f"Non-retriable HTTPError: {e}")
-                    raise e
-
+            except (aiohttp.ClientResponseError, urllib.error.HTTPError) as e:
+                # Rate limits are already waited out per request, so HTTP errors
+                # (including a limit that outlasted the probes) aren't retried.
+                logger.error(f"Non-retriable HTTPError: {e}")
+                raise
+            except (ConnectionResetError, urllib.error.URLError, TimeoutError, aiohttp.ClientConnectionError) as e:
                 if attempt == max_retries - 1:  # Last attempt
                     logger.error(f"Max retries reached for ArXiv request: {e}")
                     raise
@@ -187,17 +553,18 @@ class ArxivService:
                 raise
 
     def _process_paper(self, paper) -> Dict[str, Any]:
-        """Process ArXiv paper result into dictionary."""
+        """Process an arxiv.Result-like paper object into dictionary."""
         try:
             return {
                 "id": paper.get_short_id(),
                 "title": paper.title,
-                "authors": [author.name for author in paper.authors],
+                "authors": tuple(map(self._author_name, paper.authors)),
                 "abstract": paper.summary,
                 "pdf_url": paper.pdf_url,
                 "categories": paper.categories,
-                "published": paper.published.strftime("%Y-%m-%d"),
-                "updated": paper.updated.strftime("%Y-%m-%d"),
+                # isoformat skips strftime's format parsing; the first 10 chars are YYYY-MM-DD
+                "published": paper.published.isoformat()[:10],
+                "updated": paper.updated.isoformat()[:10],
                 "url": paper.entry_id,
                 "comment": paper.comment,
                 "primary_category": paper.primary_category
@@ -0,0 +1,120 @@
+# app/services/disk_cache.py
+
+import os
+import logging
+import tempfile
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class DiskCache:
+    """
+    Size-bounded on-disk cache of byte strings, evicting least recently used entries.
+
+    File mtimes record use, so no index has to be kept beside the entries. A
+    running byte total is kept instead of scanning the directory on every
+    call; the directory is only walked when a write takes the total past the
+    limit, and pruning frees enough room that the next walk is many writes away.
+    """
+
+    # Pruning evicts down to this fraction of the limit
+    PRUNE_TARGET = 0.9
+
+    def __init__(self, directory: Optional[str], max_bytes: int, suffix: str, name: str = "cache"):
+        """
+        Initialize the cache; with no directory every lookup misses and writes are dropped.
+
+        Args:
+            directory: Root directory of the cache
+            max_bytes: Size the entries may take up on disk
+            suffix: File suffix of the entries, so stray files are left alone
+            name: Name used in log messages
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.name = name
+
+        # Bytes on disk, measured by the first write's walk
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> str:
+        """Get the on-disk path for a key, sharded by its first two characters."""
+        return os.path.join(self.directory, key[:2], f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached data for a key, or None on a miss."""
+        if not self.directory:
+            return None
+
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Touch the file so pruning treats it as recently used
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Error reading {self.name} cache entry {key}: {str(e)}")
+            return None
+
+    def set(self, key: str, data: bytes) -> None:
+        """Atomically store data for a key, pruning if the cache has outgrown its limit."""
+        if not self.directory:
+            return
+
+        path = self.path(key)
+        try:
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Error writing {self.name} cache entry {key}: {str(e)}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self.prune()
+            else:
+                self._total_bytes += len(data) - replaced
+                if self._total_bytes > self.max_bytes:
+                    self.prune()
+
+    def prune(self) -> None:
+        """Measure the cache and evict least recently used entries if it is over its limit."""
+        try:
+            entries = []
+            total_bytes = 0
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if not name.endswith(self.suffix):
+                        continue
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total_bytes += stat.st_size
+
+            if total_bytes > self.max_bytes:
+                target = self.max_bytes * self.PRUNE_TARGET
+                for _, size, path in sorted(entries):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    total_bytes -= size
+                    if total_bytes <= target:
+                        break
+
+            self._total_bytes = total_bytes
+        except OSError as e:
+            logger.warning(f"Error pruning {self.name} cache: {str(e)}")
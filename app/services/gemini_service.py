@@ -4,6 +4,7 @@ import os
 import json
 import logging
 import re  # <-- Import the regular expression module
+from collections import Counter
 from typing import List, Dict, Any, Optional
 
 # Try different import methods
@@ -24,6 +25,12 @@ from flask import current_app
 
 logger = logging.getLogger(__name__)
 
+# Phrases that usually mark a paper's main contribution in an abstract
+_KEY_POINT_RE = re.compile(
+    r"we (?:show|demonstrate|propose|present|find|introduce|prove)|results indicate",
+    re.IGNORECASE
+)
+
 class GeminiService:
     """Service for interacting with Google Gemini API."""
     
@@ -153,13 +160,8 @@ class GeminiService:
         sentences = abstract.split('. ')
         key_points = []
         
-        indicators = [
-            "we show", "we demonstrate", "we propose", "we present",
-            "we find", "we introduce", "results indicate", "we prove"
-        ]
-        
         for sentence in sentences:
-            if any(indicator in sentence.lower() for indicator in indicators):
+            if _KEY_POINT_RE.search(sentence):
                 key_points.append(sentence + '.')
         
         if not key_points and len(sentences) > 1:
@@ -192,18 +194,14 @@ class GeminiService:
     
     def _generate_episode_title(self, papers: List[Dict[str, Any]]) -> str:
         """Generate episode title based on papers."""
-        # Extract main categories
-        all_categories = []
-        for paper in papers:
-            all_categories.extend(paper.get("categories", []))
+        # Count categories across all papers
+        category_counts = Counter(
+            cat for paper in papers for cat in paper.get("categories", [])
+        )
         
-        if all_categories:
+        if category_counts:
             # Get most common category
-            category_counts = {}
-            for cat in all_categories:
-                category_counts[cat] = category_counts.get(cat, 0) + 1
-            
-            main_category = max(category_counts.items(), key=lambda x: x[1])[0]
+            main_category = category_counts.most_common(1)[0][0]
             return f"Research Frontiers: {main_category}"
         
         return "Research Paper Discussion"
@@ -4,8 +4,9 @@ import os
 import io
 import logging
 import tempfile
+import threading
 from datetime import datetime
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
 from google.cloud import storage
 from flask import current_app
@@ -15,37 +16,96 @@ logger = logging.getLogger(__name__)
 class StorageService:
     """Service for managing file storage with Google Cloud Storage."""
     
+    # Episodes are never rewritten once uploaded, so caches can keep them forever
+    AUDIO_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+    
+    # Move rarely replayed episodes to cheaper storage after this many days
+    AUDIO_NEARLINE_AFTER_DAYS = 30
+    
+    # Chunk size for resumable uploads (must be a multiple of 256KB)
+    UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+    
+    # Client and bucket handle shared by all instances, keyed by bucket name, so
+    # credentials are resolved and the bucket checked only once per process
+    _shared_buckets = {}
+    _shared_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize storage service."""
         try:
             self.bucket_name = current_app.config.get('GCS_BUCKET_NAME', 'podcast-audio-storage')
-            self.client = storage.Client()
-            self.bucket = self.client.bucket(self.bucket_name)
             
-            # Ensure bucket exists
-            if not self.bucket.exists():
-                self.bucket = self.client.create_bucket(self.bucket_name)
-                logger.info(f"Created bucket: {self.bucket_name}")
+            with self._shared_lock:
+                shared = self._shared_buckets.get(self.bucket_name)
+                if shared is None:
+                    self.client = storage.Client()
+                    self.bucket = self.client.bucket(self.bucket_name)
+                    self._ensure_bucket()
+                    shared = (self.client, self.bucket)
+                    self._shared_buckets[self.bucket_name] = shared
+            
+            self.client, self.bucket = shared
             
         except Exception as e:
             logger.error(f"Error initializing storage service: {str(e)}")
             raise
     
-    def upload_audio(self, audio_data: bytes, filename: str) -> str:
-        """Upload audio file to storage."""
+    def _ensure_bucket(self):
+        """Create the audio bucket if it does not exist yet, and make sure it has the Nearline lifecycle rule."""
+        bucket = self.client.lookup_bucket(self.bucket_name)
+        if bucket is None:
+            bucket = self.client.create_bucket(self.bucket_name)
+            logger.info(f"Created bucket: {self.bucket_name}")
+        self.bucket = bucket
+        
+        # Buckets created before the rule existed get it here as well
+        if any(rule.get('action', {}).get('storageClass') == 'NEARLINE' for rule in bucket.lifecycle_rules):
+            return
         try:
-            # Create a unique file path
-            file_path = f"audio/{datetime.utcnow().strftime('%Y/%m/%d')}/{filename}"
+            bucket.add_lifecycle_set_storage_class_rule('NEARLINE', age=self.AUDIO_NEARLINE_AFTER_DAYS)
+            bucket.patch()
+        except Exception as e:
+            # Uploads still work without it; the worker may not be allowed to update buckets
+            logger.warning(f"Could not add the Nearline lifecycle rule to {self.bucket_name}: {str(e)}")
+    
+    def _audio_blob(self, filename: str):
+        """Create a blob handle for a new audio file with its cache metadata set."""
+        # Create a unique file path
+        file_path = f"audio/{datetime.utcnow().strftime('%Y/%m/%d')}/{filename}"
+        
+        blob = self.bucket.blob(file_path)
+        blob.cache_control = self.AUDIO_CACHE_CONTROL
+        blob.content_disposition = f'inline; filename="{filename}"'
+        return blob
+    
+    def upload_audio(self, audio_data: Union[bytes, BinaryIO], filename: str) -> str:
+        """
+        Upload audio file to storage.
         
+        File objects are sent as a chunked resumable upload, so the whole
+        episode never has to be held in memory at once.
+        """
+        try:
             # Upload to GCS
-            blob = self.bucket.blob(file_path)
-            blob.upload_from_string(audio_data, content_type='audio/mpeg')
+            blob = self._audio_blob(filename)
+            # MP3 is already compressed, so no content encoding is applied.
+            # if_generation_match=0 fails fast instead of overwriting an existing episode.
+            if isinstance(audio_data, bytes):
+                blob.upload_from_string(audio_data, content_type='audio/mpeg', if_generation_match=0)
+            else:
+                blob.chunk_size = self.UPLOAD_CHUNK_SIZE
+                blob.upload_from_file(
+                    audio_data,
+                    content_type='audio/mpeg',
+                    rewind=True,
+                    if_generation_match=0
+                )
         
             # Remove this line that's causing the error:
             # blob.make_public()
         
             # Return the storage URL (not public URL)
-            return f"gs://{self.bucket_name}/{file_path}"
+            return f"gs://{self.bucket_name}/{blob.name}"
         
         except Exception as e:
             logger.error(f"Error uploading audio: {str(e)}")
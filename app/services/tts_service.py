@@ -2,17 +2,122 @@
 
 import os
 import io
+import hashlib
 import logging
+import re
 import tempfile
-import re  # <-- Import the regular expression module
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape as xml_escape
 
 from google.cloud import texttospeech
+from google.cloud.texttospeech_v1.services.text_to_speech.transports import TextToSpeechGrpcTransport
 from pydub import AudioSegment
+from mutagen.mp3 import MP3
 from flask import current_app
 
+from .disk_cache import DiskCache
+
+try:
+    import lameenc
+except ImportError:
+    # Fall back to pydub's ffmpeg export
+    lameenc = None
+
 logger = logging.getLogger(__name__)
 
+# Translation table that deletes markdown emphasis and bracket characters
+_MARKDOWN_STRIP_TABLE = str.maketrans('', '', '*_[]()')
+
+
+@lru_cache(maxsize=4096)
+def _clean_text_cached(text: str) -> str:
+    """Strip markdown from segment text; memoized because scripts repeat short lines."""
+    # This removes *, **, _, __, and any brackets [] or parentheses ()
+    # which are often used for non-verbal cues in scripts.
+    return text.translate(_MARKDOWN_STRIP_TABLE).strip()
+
+
+# Terms that should be spelled out, and their SSML replacements
+_SSML_TERMS = {
+    "ArXiv": '<say-as interpret-as="spell-out">ArXiv</say-as>',
+    "AI": '<say-as interpret-as="spell-out">A I</say-as>',
+    "ML": '<say-as interpret-as="spell-out">M L</say-as>',
+}
+_SSML_TERMS_RE = re.compile(r"\b(?:ArXiv|AI|ML)\b")
+
+def _mark_ssml_terms(text: str) -> str:
+    """Wrap the terms that should be spelled out in SSML."""
+    # One pass over the text; word boundaries keep words such as "retail" or "HTML" intact
+    return _SSML_TERMS_RE.sub(lambda match: _SSML_TERMS[match.group(0)], text)
+
+# gRPC channel options: keep the connection warm between tasks and allow large audio responses
+_GRPC_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+]
+
+# Google TTS rejects requests over 5000 bytes of text; leave headroom
+MAX_REQUEST_TEXT_BYTES = 4500
+
+# Silence after every turn, both between synthesized segments and inside merged ones
+SEGMENT_PAUSE_MS = 500
+
+# Exported episodes larger than this are spooled to disk instead of kept in memory
+AUDIO_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# PCM frames passed to the MP3 encoder per call
+MP3_ENCODE_CHUNK_FRAMES = 256 * 1024
+
+# Pause between merged turns, matching the gap left between separate segments
+_SSML_TURN_BREAK = f'<break time="{SEGMENT_PAUSE_MS}ms"/>'
+
+def _ssml_body(text: str, is_ssml: bool) -> str:
+    """Return a job's text as SSML, escaping plain text."""
+    return text if is_ssml else xml_escape(text)
+
+
+_tts_client = None
+_tts_client_lock = threading.Lock()
+
+
+def _init_grpc_for_gevent() -> None:
+    """Make gRPC cooperate with gevent when running in a monkey-patched worker."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return
+    if monkey.is_module_patched("socket"):
+        from grpc.experimental import gevent as grpc_gevent
+        grpc_gevent.init_gevent()
+
+
+def get_tts_client() -> texttospeech.TextToSpeechClient:
+    """Return the process-wide TextToSpeechClient, creating it on first use."""
+    global _tts_client
+    if _tts_client is None:
+        with _tts_client_lock:
+            if _tts_client is None:
+                _init_grpc_for_gevent()
+                channel = TextToSpeechGrpcTransport.create_channel(options=_GRPC_CHANNEL_OPTIONS)
+                _tts_client = texttospeech.TextToSpeechClient(
+                    transport=TextToSpeechGrpcTransport(channel=channel)
+                )
+    return _tts_client
+
+
+def warm_up_tts_client() -> None:
+    """Open the TTS channel ahead of the first synthesis request."""
+    try:
+        get_tts_client().list_voices(language_code="en-US")
+        logger.info("TTS client warmed up")
+    except Exception as e:
+        logger.warning(f"TTS client warm-up failed: {str(e)}")
+
+
 class TTSService:
     """Service for text-to-speech conversion using Google Cloud TTS."""
 
@@ -34,8 +139,21 @@ class TTSService:
     def __init__(self):
         """Initialize TTS service."""
         try:
-            self.client = texttospeech.TextToSpeechClient()
+            self.client = get_tts_client()
             self.sample_rate = 24000
+            self.max_concurrency = current_app.config.get('TTS_MAX_CONCURRENCY', 8)
+            self.cache = DiskCache(
+                current_app.config.get('TTS_CACHE_DIR'),
+                current_app.config.get('TTS_CACHE_MAX_BYTES', 10 * 1024 ** 3),
+                suffix='.wav',
+                name='TTS'
+            )
+            
+            # Build the request messages for each voice once instead of on every segment
+            self.voice_configs = {
+                speaker: self._build_voice_config(profile)
+                for speaker, profile in self.VOICE_PROFILES.items()
+            }
             
         except Exception as e:
             logger.error(f"Error initializing TTS service: {str(e)}")
@@ -44,20 +162,22 @@ class TTSService:
     # ==> ADD THIS NEW HELPER METHOD <==
     def _clean_text(self, text: str) -> str:
         """Removes markdown and other unwanted symbols for cleaner TTS output."""
-        # This regex removes *, **, _, __, and any brackets [] or parentheses ()
-        # which are often used for non-verbal cues in scripts.
-        text = re.sub(r'(\*{1,2}|_{1,2}|[\[\]\(\)])', '', text)
-        return text.strip()
+        return _clean_text_cached(text)
 
     def generate_audio(
         self,
         script_content: Dict[str, Any],
         voice_preference: str = "mixed"
-    ) -> bytes:
-        """Generate audio from script content."""
+    ) -> BinaryIO:
+        """
+        Generate audio from script content.
+        
+        Returns a file object positioned at the start of the MP3. Small episodes
+        stay in memory; larger ones spill to a temporary file on disk.
+        """
         try:
-            # Parse script and generate audio segments
-            audio_segments = []
+            # Parse script into (speaker, text, is_ssml) jobs
+            jobs = []
             
             for section in script_content.get("sections", []):
                 for segment in section.get("segments", []):
@@ -74,59 +194,173 @@ class TTSService:
                     if not cleaned_text:
                         continue
                     
-                    # Generate audio for this segment
-                    audio_data = self._synthesize_speech(cleaned_text, speaker) # Use cleaned_text
-                    audio_segment = AudioSegment.from_mp3(io.BytesIO(audio_data))
-                    
-                    # Add segment to collection
-                    audio_segments.append(audio_segment)
-                    
-                    # Add pause between segments
-                    pause = AudioSegment.silent(duration=500)  # 500ms pause
-                    audio_segments.append(pause)
+                    jobs.append(self._turn_job(speaker, cleaned_text))
             
-            # Combine all segments
-            if not audio_segments:
-                raise ValueError("No audio segments generated")
+            jobs = self._pack_jobs(jobs)
             
-            combined = audio_segments[0]
-            for segment in audio_segments[1:]:
-                combined += segment
+            # Synthesize and decode segments on worker threads while this thread
+            # combines finished segments in script order as they arrive
+            combined = None
+            if jobs:
+                max_workers = max(1, min(self.max_concurrency, len(jobs)))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    combined = self._concatenate_segments(
+                        executor.map(self._synthesize_segment, jobs),
+                        pause_ms=SEGMENT_PAUSE_MS
+                    )
+            
+            if combined is None:
+                raise ValueError("No audio segments generated")
             
             # Export as MP3
-            output_buffer = io.BytesIO()
-            combined.export(output_buffer, format="mp3", bitrate="192k")
-            output_buffer.seek(0)
+            output_file = tempfile.SpooledTemporaryFile(max_size=AUDIO_SPOOL_MAX_BYTES)
+            self._encode_mp3(combined, output_file)
+            output_file.seek(0)
             
-            return output_buffer.getvalue()
+            return output_file
             
         except Exception as e:
             logger.error(f"Error generating audio: {str(e)}")
             raise
     
-    def _synthesize_speech(self, text: str, speaker: str) -> bytes:
-        """Synthesize speech for a specific speaker."""
+    def _encode_mp3(self, audio: AudioSegment, output_file: BinaryIO) -> None:
+        """Encode audio as 192kbps MP3, in-process with LAME when lameenc is installed."""
+        if lameenc is None:
+            audio.export(output_file, format="mp3", bitrate="192k")
+            return
+        
+        audio = audio.set_sample_width(2)  # LAME takes 16-bit PCM
+        encoder = lameenc.Encoder()
+        encoder.set_bit_rate(192)
+        encoder.set_in_sample_rate(audio.frame_rate)
+        encoder.set_channels(audio.channels)
+        encoder.set_quality(2)
+        
+        # Feed the PCM in frame-aligned chunks so the MP3 streams into the output file
+        pcm = memoryview(audio.raw_data)
+        chunk_size = MP3_ENCODE_CHUNK_FRAMES * audio.frame_width
+        for offset in range(0, len(pcm), chunk_size):
+            output_file.write(encoder.encode(bytes(pcm[offset:offset + chunk_size])))
+        output_file.write(encoder.flush())
+    
+    def _turn_job(self, speaker: str, text: str) -> Tuple[str, str, bool]:
+        """
+        Build the synthesis job for one turn, with the SSML term enhancements applied.
+        
+        Turns without terms to spell out stay plain text. SSML jobs carry the
+        body of the document; the <speak> root is added when it is sent.
+        """
+        escaped = xml_escape(text)
+        marked = _mark_ssml_terms(escaped)
+        if marked == escaped:
+            return speaker, text, False
+        return speaker, marked, True
+    
+    def _pack_jobs(self, jobs: List[Tuple[str, str, bool]]) -> List[Tuple[str, str, bool]]:
+        """
+        Merge consecutive turns by the same speaker into one synthesis request.
+        
+        Turns are packed greedily while the request stays under the TTS text
+        limit, so long monologues cost one round trip instead of one per line.
+        Merged turns become SSML with a break between them, so they keep the
+        same pause as turns synthesized separately.
+        """
+        packed = []
+        for speaker, text, is_ssml in jobs:
+            if packed and packed[-1][0] == speaker:
+                _, last_text, last_is_ssml = packed[-1]
+                merged_text = _ssml_body(last_text, last_is_ssml) + _SSML_TURN_BREAK + _ssml_body(text, is_ssml)
+                if len(merged_text.encode('utf-8')) <= MAX_REQUEST_TEXT_BYTES:
+                    packed[-1] = (speaker, merged_text, True)
+                    continue
+            packed.append((speaker, text, is_ssml))
+        return packed
+    
+    def _concatenate_segments(self, audio_segments: Iterable[AudioSegment], pause_ms: int) -> Optional[AudioSegment]:
+        """
+        Join segments with a pause after each one using a single buffer join.
+        
+        Appending AudioSegments one at a time copies the growing result on every
+        step; joining the raw PCM once keeps the copy linear in the episode length.
+        Segments are consumed lazily, so each one is released as soon as its PCM
+        is collected. Returns None when there are no segments.
+        """
+        segments = iter(audio_segments)
+        reference = next(segments, None)
+        if reference is None:
+            return None
+        
+        frame_rate = reference.frame_rate
+        channels = reference.channels
+        sample_width = reference.sample_width
+        
+        pause_frames = int(frame_rate * pause_ms / 1000)
+        pause_data = bytes(pause_frames * channels * sample_width)
+        
+        chunks = [reference.raw_data, pause_data]
+        for segment in segments:
+            if (segment.frame_rate, segment.channels, segment.sample_width) != (frame_rate, channels, sample_width):
+                segment = (segment.set_frame_rate(frame_rate)
+                                  .set_channels(channels)
+                                  .set_sample_width(sample_width))
+            chunks.append(segment.raw_data)
+            chunks.append(pause_data)
+        
+        return AudioSegment(
+            data=b"".join(chunks),
+            sample_width=sample_width,
+            frame_rate=frame_rate,
+            channels=channels
+        )
+    
+    def _build_voice_config(
+        self,
+        voice_profile: Dict[str, Any]
+    ) -> Tuple[texttospeech.VoiceSelectionParams, texttospeech.AudioConfig]:
+        """Build the voice and audio request messages for a voice profile."""
+        # Configure voice
+        voice = texttospeech.VoiceSelectionParams(
+            language_code="en-US",
+            name=voice_profile["name"],
+            ssml_gender=getattr(texttospeech.SsmlVoiceGender, voice_profile["gender"])
+        )
+        
+        # Configure audio; request uncompressed PCM so segments need no MP3 decode
+        audio_config = texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+            speaking_rate=voice_profile["speaking_rate"],
+            pitch=voice_profile["pitch"],
+            sample_rate_hertz=self.sample_rate
+        )
+        
+        return voice, audio_config
+    
+    def _synthesize_segment(self, job: Tuple[str, str, bool]) -> AudioSegment:
+        """Synthesize and decode one (speaker, text, is_ssml) job; runs in a worker thread."""
+        speaker, text, is_ssml = job
+        audio_data = self._synthesize_speech(text, speaker, is_ssml)
+        # LINEAR16 responses are WAV files, which pydub reads without ffmpeg
+        return AudioSegment.from_wav(io.BytesIO(audio_data))
+    
+    def _synthesize_speech(self, text: str, speaker: str, is_ssml: bool = False) -> bytes:
+        """Synthesize speech for a specific speaker, reusing cached audio when available."""
         try:
             # Get voice profile
-            voice_profile = self.VOICE_PROFILES.get(speaker, self.VOICE_PROFILES["alex"])
-            
-            # Prepare input
-            synthesis_input = texttospeech.SynthesisInput(text=text)
+            if speaker not in self.VOICE_PROFILES:
+                speaker = "alex"
+            voice_profile = self.VOICE_PROFILES[speaker]
             
-            # Configure voice
-            voice = texttospeech.VoiceSelectionParams(
-                language_code="en-US",
-                name=voice_profile["name"],
-                ssml_gender=getattr(texttospeech.SsmlVoiceGender, voice_profile["gender"])
-            )
+            cache_key = self._cache_key(text, voice_profile, is_ssml)
+            cached_audio = self.cache.get(cache_key)
+            if cached_audio is not None:
+                return cached_audio
             
-            # Configure audio
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
-                speaking_rate=voice_profile["speaking_rate"],
-                pitch=voice_profile["pitch"],
-                sample_rate_hertz=self.sample_rate
-            )
+            # Prepare input
+            if is_ssml:
+                synthesis_input = texttospeech.SynthesisInput(ssml=f"<speak>{text}</speak>")
+            else:
+                synthesis_input = texttospeech.SynthesisInput(text=text)
+            voice, audio_config = self.voice_configs[speaker]
             
             # Synthesize speech
             response = self.client.synthesize_speech(
@@ -137,17 +371,32 @@ class TTSService:
                 }
             )
             
+            self.cache.set(cache_key, response.audio_content)
             return response.audio_content
             
         except Exception as e:
             logger.error(f"Error synthesizing speech: {str(e)}")
             raise
     
-    def get_audio_duration(self, audio_data: bytes) -> Optional[int]:
+    def _cache_key(self, text: str, voice_profile: Dict[str, Any], is_ssml: bool = False) -> str:
+        """Build the cache key for a synthesis request."""
+        raw_key = (
+            f"{'SSML|' if is_ssml else ''}LINEAR16|{voice_profile['name']}|{voice_profile['speaking_rate']}|"
+            f"{voice_profile['pitch']}|{self.sample_rate}|{text}"
+        )
+        return hashlib.blake2b(raw_key.encode('utf-8'), digest_size=20).hexdigest()
+    
+    def get_audio_duration(self, audio_data: Union[bytes, BinaryIO]) -> Optional[int]:
         """Get duration of audio in seconds."""
         try:
-            audio = AudioSegment.from_mp3(io.BytesIO(audio_data))
-            return int(audio.duration_seconds)
+            if isinstance(audio_data, bytes):
+                audio_data = io.BytesIO(audio_data)
+            
+            # Read the duration from the MP3 frame headers instead of decoding the audio
+            audio_data.seek(0)
+            duration = int(MP3(audio_data).info.length)
+            audio_data.seek(0)
+            return duration
             
         except Exception as e:
             logger.error(f"Error getting audio duration: {str(e)}")
@@ -162,9 +411,4 @@ class TTSService:
             </prosody>
         </speak>"""
         
-        # Apply specific enhancements
-        ssml = ssml.replace("ArXiv", '<say-as interpret-as="spell-out">ArXiv</say-as>')
-        ssml = ssml.replace("AI", '<say-as interpret-as="spell-out">A I</say-as>')
-        ssml = ssml.replace("ML", '<say-as interpret-as="spell-out">M L</say-as>')
-        
-        return ssml
\ No newline at end of file
+        return _mark_ssml_terms(ssml)
\ No newline at end of file
@@ -1,32 +1,59 @@
 # app/tasks/podcast_tasks.py
 
 from datetime import datetime, timezone # Added timezone
+import io
 import logging
+import time
 import uuid
 
+from celery.concurrency.prefork import TaskPool as PreforkPool
+from celery.signals import worker_process_init, worker_ready
 from flask import current_app # Import current_app for config access
+from sqlalchemy.orm import joinedload
 
 from .. import celery, db
 from ..models import User, Podcast, PodcastScript, PodcastAudio, GenerationTask
 from ..services.arxiv_service import ArxivService
 from ..services.gemini_service import GeminiService
-from ..services.tts_service import TTSService
+from ..services.tts_service import TTSService, warm_up_tts_client
 from ..services.storage_service import StorageService
+from ..services import get_service
 
 logger = logging.getLogger(__name__)
 
+
+def _get_generation_task(task_id, task_pk=None):
+    """Load a GenerationTask by primary key when the caller knows it."""
+    if task_pk is not None:
+        return db.session.get(GenerationTask, task_pk)
+    return GenerationTask.query.filter_by(task_id=task_id).first()
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Open the TTS channel in each worker process before it takes a task."""
+    warm_up_tts_client()
+
+
+@worker_ready.connect
+def init_worker(sender=None, **kwargs):
+    """Open the TTS channel for pools that run tasks in the main process (gevent, eventlet, solo)."""
+    if not isinstance(getattr(sender, 'pool', None), PreforkPool):
+        warm_up_tts_client()
+
+
 @celery.task(bind=True)
-def generate_podcast_script(self, task_id, podcast_id, use_preferences=True, paper_ids=None):
+def generate_podcast_script(self, task_id, podcast_id, use_preferences=True, paper_ids=None, task_pk=None):
     task = None
     podcast_obj = None
+    started = time.monotonic()  # For elapsed-time logging; persisted timestamps stay wall-clock
     try:
-        task = GenerationTask.query.filter_by(task_id=task_id).first()
+        task = _get_generation_task(task_id, task_pk)
         if not task:
             raise Exception(f"Script generation task not found: {task_id}")
 
         task.status = GenerationTask.STATUS_PROCESSING
         task.started_at = datetime.now(timezone.utc) # Use timezone-aware UTC
-        db.session.commit()
 
         podcast_obj = Podcast.query.get(podcast_id)
         user = User.query.get(task.user_id)
@@ -34,13 +61,14 @@ def generate_podcast_script(self, task_id, podcast_id, use_preferences=True, pap
         if not podcast_obj or not user:
             raise Exception("Podcast or user not found for script generation.")
 
+        # Stage both status changes and publish them in one commit
         podcast_obj.status = Podcast.STATUS_PROCESSING
         db.session.commit()
 
         if hasattr(self, 'update_state'): # Check if self is a Celery task instance
             self.update_state(state='PROGRESS', meta={'progress': 10})
 
-        arxiv_service = ArxivService()
+        arxiv_service = get_service(ArxivService)
         fetched_papers_data = None
 
         if use_preferences and user.preferences:
@@ -53,11 +81,8 @@ def generate_podcast_script(self, task_id, podcast_id, use_preferences=True, pap
                 sort_by_preference=user.preferences.sort_by
             )
         elif paper_ids:
-           temp_papers_list = []
-           for paper_id_val in paper_ids:
-                paper = arxiv_service.get_paper_by_id(paper_id_val)
-                if paper:
-                    temp_papers_list.append(paper)
+           # One request for all the papers instead of one per ID
+           temp_papers_list = arxiv_service.get_papers_by_ids(paper_ids)
 
         # elif paper_ids:
         #     temp_papers_list = []
@@ -76,8 +101,8 @@ def generate_podcast_script(self, task_id, podcast_id, use_preferences=True, pap
         #         'primary_category': 'cs.AI'
         #         }
         #         temp_papers_list.append(mock_paper)
-                if temp_papers_list:
-                    fetched_papers_data = (temp_papers_list, len(temp_papers_list))
+           if temp_papers_list:
+               fetched_papers_data = (temp_papers_list, len(temp_papers_list))
         else:
             raise Exception("No paper source defined: use_preferences or paper_ids required.")
 
@@ -89,7 +114,7 @@ def generate_podcast_script(self, task_id, podcast_id, use_preferences=True, pap
         if hasattr(self, 'update_state'):
             self.update_state(state='PROGRESS', meta={'progress': 30})
 
-        gemini_service = GeminiService()
+        gemini_service = get_service(GeminiService)
         script_content = gemini_service.generate_script(
             papers=papers,
             technical_level=podcast_obj.technical_level,
@@ -111,29 +136,26 @@ def generate_podcast_script(self, task_id, podcast_id, use_preferences=True, pap
         task.progress = 100
         task.completed_at = datetime.now(timezone.utc) # Use timezone-aware UTC
 
+        # The audio task's ID doubles as its Celery task ID, so the record is
+        # complete at insert and needs no follow-up commit after dispatch.
         audio_task_id = str(uuid.uuid4())
         audio_task_record = GenerationTask(
             user_id=user.id,
             podcast_id=podcast_obj.id,
             task_id=audio_task_id,
             task_type=GenerationTask.TYPE_AUDIO_GENERATION,
-            status=GenerationTask.STATUS_QUEUED
+            status=GenerationTask.STATUS_QUEUED,
+            task_data={'celery_task_id': audio_task_id}
         )
         db.session.add(audio_task_record)
         db.session.commit()
 
-        celery_audio_task = generate_podcast_audio.delay(
-            task_id=audio_task_id,
-            podcast_id=podcast_obj.id
+        generate_podcast_audio.apply_async(
+            kwargs={'task_id': audio_task_id, 'podcast_id': podcast_obj.id, 'task_pk': audio_task_record.id},
+            task_id=audio_task_id
         )
-        
-        committed_audio_task_record = GenerationTask.query.filter_by(task_id=audio_task_id).first()
-        if committed_audio_task_record:
-            committed_audio_task_record.metadata = {'celery_task_id': celery_audio_task.id}
-            db.session.commit()
-        else:
-            logger.error(f"Failed to find committed audio task record for ID {audio_task_id} to update with Celery ID.")
 
+        logger.info(f"Script for podcast_id {podcast_id} generated in {time.monotonic() - started:.2f}s")
         return {'status': 'script_completed', 'audio_task_id': audio_task_id, 'progress': 100}
 
     except Exception as e:
@@ -153,11 +175,12 @@ def generate_podcast_script(self, task_id, podcast_id, use_preferences=True, pap
 
 
 @celery.task(bind=True)
-def generate_podcast_audio(self, task_id, podcast_id):
+def generate_podcast_audio(self, task_id, podcast_id, task_pk=None):
     task = None
     podcast_obj = None
+    started = time.monotonic()  # For elapsed-time logging; persisted timestamps stay wall-clock
     try:
-        task = GenerationTask.query.filter_by(task_id=task_id).first()
+        task = _get_generation_task(task_id, task_pk)
         if not task:
             logger.error(f"Audio generation task record not found in DB for task_id: {task_id}")
             raise Exception(f"Audio generation task not found: {task_id}")
@@ -166,7 +189,8 @@ def generate_podcast_audio(self, task_id, podcast_id):
         task.started_at = datetime.now(timezone.utc)
         db.session.commit()
 
-        podcast_obj = Podcast.query.get(podcast_id)
+        # Load the script with the podcast; the audio task always needs it
+        podcast_obj = db.session.get(Podcast, podcast_id, options=[joinedload(Podcast.script)])
         if not podcast_obj or not podcast_obj.script:
             raise Exception(f"Podcast (ID: {podcast_id}) or its script not found for audio generation.")
 
@@ -177,32 +201,33 @@ def generate_podcast_audio(self, task_id, podcast_id):
         if hasattr(self, 'update_state'):
             self.update_state(state='PROGRESS', meta={'progress': 10})
 
-        tts_service = TTSService()
-        audio_file_bytes = tts_service.generate_audio(
+        tts_service = get_service(TTSService)
+        with tts_service.generate_audio(
             script_content=podcast_obj.script.script_content,
             voice_preference='mixed'
-        )
-        
-        # ==> ADD THIS LINE TO CHECK THE AUDIO DATA SIZE <==
-        logger.info(f"AUDIO_TASK: Generated audio data size: {len(audio_file_bytes)} bytes")
-
-        if len(audio_file_bytes) < 1000:
-            raise ValueError("Generated audio is too small. Check TTS service for errors.")
-
-        if hasattr(self, 'update_state'):
-            self.update_state(state='PROGRESS', meta={'progress': 60})
-
-        storage_service = StorageService()
-        file_url = storage_service.upload_audio(
-            audio_file_bytes,
-            filename=f"podcast_{podcast_obj.id}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.mp3"
-        )
+        ) as audio_file:
+            file_size = audio_file.seek(0, io.SEEK_END)
+            audio_file.seek(0)
+            
+            # ==> ADD THIS LINE TO CHECK THE AUDIO DATA SIZE <==
+            logger.info(f"AUDIO_TASK: Generated audio data size: {file_size} bytes")
+
+            if file_size < 1000:
+                raise ValueError("Generated audio is too small. Check TTS service for errors.")
+
+            if hasattr(self, 'update_state'):
+                self.update_state(state='PROGRESS', meta={'progress': 60})
+
+            storage_service = get_service(StorageService)
+            file_url = storage_service.upload_audio(
+                audio_file,
+                filename=f"podcast_{podcast_obj.id}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.mp3"
+            )
 
-        if hasattr(self, 'update_state'):
-            self.update_state(state='PROGRESS', meta={'progress': 80})
+            if hasattr(self, 'update_state'):
+                self.update_state(state='PROGRESS', meta={'progress': 80})
 
-        file_size = len(audio_file_bytes)
-        duration = tts_service.get_audio_duration(audio_file_bytes)
+            duration = tts_service.get_audio_duration(audio_file)
 
         audio_record = PodcastAudio(
             podcast_id=podcast_obj.id,
@@ -213,15 +238,17 @@ def generate_podcast_audio(self, task_id, podcast_id):
         )
         db.session.add(audio_record)
 
+        completed_at = datetime.now(timezone.utc)
         podcast_obj.status = Podcast.STATUS_COMPLETED
-        podcast_obj.completed_at = datetime.now(timezone.utc)
+        podcast_obj.completed_at = completed_at
         podcast_obj.error_message = None
 
         task.status = GenerationTask.STATUS_COMPLETED
-        task.completed_at = datetime.now(timezone.utc)
+        task.completed_at = completed_at
         task.progress = 100
         db.session.commit()
 
+        logger.info(f"Audio for podcast_id {podcast_id} generated in {time.monotonic() - started:.2f}s")
         return {'status': 'audio_completed', 'file_url': file_url, 'progress': 100}
 
     except Exception as e:
@@ -1,4 +1,8 @@
 #!/usr/bin/env python
+# Tasks are network-bound, so the worker runs on gevent; patch before anything imports sockets
+from gevent import monkey
+monkey.patch_all()
+
 import os
 from app import create_app, celery
 
@@ -12,4 +16,4 @@ from app.tasks import podcast_tasks
 # The celery app is now configured with Flask's config
 if __name__ == '__main__':
     # Start worker instead of generic celery.start()
-    celery.worker_main(['worker', '--loglevel=info'])
+    celery.worker_main(['worker', '--loglevel=info', '--pool=gevent', '--concurrency=100'])
@@ -9,28 +9,118 @@ Run this after setting up all three services to verify everything works.
 """
 
 import os
+import asyncio
+import functools
+import hashlib
+import io
+import shelve
+import sys
+import threading
+import uuid
+from types import SimpleNamespace
 from dotenv import load_dotenv
 
-def print_section(title):
-    print(f"\n{'='*60}")
-    print(f"🧪 {title}")
-    print('='*60)
+@functools.lru_cache(maxsize=1)
+def _tts_client():
+    """Shared TTS client, so auth and the gRPC channel are set up once per run."""
+    from google.cloud import texttospeech
+    return texttospeech.TextToSpeechClient()
 
-def print_result(test_name, success, details=""):
+@functools.lru_cache(maxsize=1)
+def _storage_client():
+    """Shared Cloud Storage client."""
+    from google.cloud import storage
+    return storage.Client()
+
+def _warm_tts_channel():
+    """Connect the TTS gRPC channel now, so the first synthesis skips the TLS handshake."""
+    import grpc
+    channel = _tts_client().transport.grpc_channel
+    grpc.channel_ready_future(channel).result(timeout=5)
+
+async def _prewarm_clients():
+    """Build the shared clients up front; any failure is left for the checks to report."""
+    await asyncio.gather(
+        asyncio.to_thread(_warm_tts_channel),
+        asyncio.to_thread(_storage_client),
+        return_exceptions=True
+    )
+
+class _CachedModel:
+    """Wraps a Gemini model so identical prompts are only billed once."""
+    
+    def __init__(self, model):
+        self.model = model
+        self._answers = {}
+    
+    def _generate_text(self, prompt):
+        if prompt in self._answers:
+            return self._answers[prompt]
+        
+        # Set GEMINI_CACHE_FILE to also keep answers between runs
+        cache_file = os.getenv('GEMINI_CACHE_FILE')
+        if not cache_file:
+            text = self.model.generate_content(prompt).text
+        else:
+            key = hashlib.blake2b(prompt.encode('utf-8')).hexdigest()
+            with shelve.open(cache_file) as cache:
+                if key not in cache:
+                    cache[key] = self.model.generate_content(prompt).text
+                text = cache[key]
+        
+        self._answers[prompt] = text
+        return text
+    
+    def generate_content(self, prompt):
+        return SimpleNamespace(text=self._generate_text(prompt))
+
+@functools.lru_cache(maxsize=1)
+def _gemini_service():
+    """Shared Gemini service; the first call must run inside an app context."""
+    from app.services.gemini_service import GeminiService
+    service = GeminiService()
+    service.model = _CachedModel(service.model)
+    return service
+
+# Guards stdout so each check's buffered report is written in one piece
+_print_lock = threading.Lock()
+
+def print_section(title, out=None):
+    print(f"\n{'='*60}", file=out)
+    print(f"🧪 {title}", file=out)
+    print('='*60, file=out)
+
+def print_result(test_name, success, details="", out=None):
     status = "✅ PASS" if success else "❌ FAIL"
-    print(f"{status} {test_name}")
+    print(f"{status} {test_name}", file=out)
     if details:
-        print(f"   {details}")
+        print(f"   {details}", file=out)
+
+# The concurrent checks are named check_* rather than test_*, so pytest run
+# from the repo root doesn't collect them as tests needing an `out` fixture
+def _buffered_output(check):
+    """Collect a concurrent check's report and print it all at once when it ends."""
+    @functools.wraps(check)
+    async def wrapper():
+        out = io.StringIO()
+        try:
+            return await check(out)
+        finally:
+            with _print_lock:
+                sys.stdout.write(out.getvalue())
+                sys.stdout.flush()
+    return wrapper
 
-def test_tts():
+@_buffered_output
+async def check_tts(out):
     """Test Text-to-Speech service"""
-    print_section("TEXT-TO-SPEECH SERVICE")
+    print_section("TEXT-TO-SPEECH SERVICE", out=out)
     
     try:
         from google.cloud import texttospeech
         
-        client = texttospeech.TextToSpeechClient()
-        print_result("TTS Client initialization", True)
+        client = await asyncio.to_thread(_tts_client)
+        print_result("TTS Client initialization", True, out=out)
         
         # Generate test audio
         synthesis_input = texttospeech.SynthesisInput(text="Testing TTS service")
@@ -43,41 +133,41 @@ def test_tts():
             audio_encoding=texttospeech.AudioEncoding.MP3
         )
         
-        response = client.synthesize_speech(
+        response = await asyncio.to_thread(
+            client.synthesize_speech,
             input=synthesis_input,
             voice=voice,
             audio_config=audio_config
         )
         
         audio_size = len(response.audio_content)
-        print_result("Audio generation", audio_size > 0, f"{audio_size} bytes generated")
+        print_result("Audio generation", audio_size > 0, f"{audio_size} bytes generated", out=out)
         
         return True
         
     except Exception as e:
-        print_result("TTS Service", False, str(e))
+        print_result("TTS Service", False, str(e), out=out)
         return False
 
-def test_storage():
+@_buffered_output
+async def check_storage(out):
     """Test Cloud Storage service"""
-    print_section("CLOUD STORAGE SERVICE")
+    print_section("CLOUD STORAGE SERVICE", out=out)
     
     bucket_name = os.getenv('GCS_BUCKET_NAME')
     if not bucket_name:
-        print_result("Storage configuration", False, "GCS_BUCKET_NAME not set in .env")
+        print_result("Storage configuration", False, "GCS_BUCKET_NAME not set in .env", out=out)
         return False
     
     try:
-        from google.cloud import storage
-        
-        client = storage.Client()
+        client = await asyncio.to_thread(_storage_client)
         bucket = client.bucket(bucket_name)
         
-        print_result("Storage client initialization", True)
+        print_result("Storage client initialization", True, out=out)
         
         # Test bucket access
-        bucket_exists = bucket.exists()
-        print_result("Bucket access", bucket_exists, f"Bucket: {bucket_name}")
+        bucket_exists = await asyncio.to_thread(bucket.exists)
+        print_result("Bucket access", bucket_exists, f"Bucket: {bucket_name}", out=out)
         
         if not bucket_exists:
             return False
@@ -85,48 +175,49 @@ def test_storage():
         # Test file upload
         test_content = b"Test file for Fionntan services validation"
         blob = bucket.blob("test/validation_test.txt")
-        blob.upload_from_string(test_content, content_type='text/plain')
-        print_result("File upload", True, "Test file uploaded")
+        await asyncio.to_thread(blob.upload_from_string, test_content, content_type='text/plain')
+        print_result("File upload", True, "Test file uploaded", out=out)
         
         # Test file download
-        downloaded = blob.download_as_bytes()
+        downloaded = await asyncio.to_thread(blob.download_as_bytes)
         download_success = downloaded == test_content
-        print_result("File download", download_success, "Content verified")
+        print_result("File download", download_success, "Content verified", out=out)
         
         # Cleanup
-        blob.delete()
-        print_result("File cleanup", True, "Test file deleted")
+        await asyncio.to_thread(blob.delete)
+        print_result("File cleanup", True, "Test file deleted", out=out)
         
         return True
         
     except Exception as e:
-        print_result("Storage Service", False, str(e))
+        print_result("Storage Service", False, str(e), out=out)
         return False
 
 
-def test_gemini():
+@_buffered_output
+async def check_gemini(out):
     """Test Gemini API service"""
-    print_section("GEMINI API SERVICE")
+    print_section("GEMINI API SERVICE", out=out)
     
     try:
         from app import create_app
-        from app.services.gemini_service import GeminiService
         
         app = create_app('development')
         with app.app_context():
-            service = GeminiService()
-            print_result("Gemini client initialization", True)
+            # Worker threads inherit the app context through contextvars
+            service = await asyncio.to_thread(_gemini_service)
+            print_result("Gemini client initialization", True, out=out)
             
             # Test basic generation
             mock_papers = [{'id': 'test', 'title': 'Test Paper', 'abstract': 'Test abstract', 'authors': ['Test Author']}]
-            response = service.generate_script(papers=mock_papers, target_length=5)
+            response = await asyncio.to_thread(service.generate_script, papers=mock_papers, target_length=5)
             
             has_script = bool(response and 'title' in response)
-            print_result("Script generation", has_script)
+            print_result("Script generation", has_script, out=out)
             
             return True
     except Exception as e:
-        print_result("Gemini Service", False, str(e))
+        print_result("Gemini Service", False, str(e), out=out)
         return False
 
 
@@ -137,36 +228,54 @@ def test_end_to_end_workflow():
     try:
         from app import create_app
         from app.services.arxiv_service import ArxivService
-        from app.services.gemini_service import GeminiService
         from app.services.tts_service import TTSService
         from app.services.storage_service import StorageService
         
+        async def run_e2e():
+            # Set up the TTS client and check the storage bucket in the background;
+            # neither depends on the papers or the script
+            tts_task = asyncio.create_task(asyncio.to_thread(TTSService))
+            storage_task = asyncio.create_task(asyncio.to_thread(StorageService))
+            
+            try:
+                # Step 1: Get papers
+                arxiv_service = ArxivService()
+                papers, total = await asyncio.to_thread(
+                    arxiv_service.search_papers, topics=['machine learning'], max_results=1
+                )
+                print_result("Paper retrieval", len(papers) > 0, f"Found {len(papers)} papers")
+                
+                # Step 2: Generate script
+                gemini_service = await asyncio.to_thread(_gemini_service)
+                script = await asyncio.to_thread(gemini_service.generate_script, papers=papers[:1], target_length=5)
+                print_result("Script generation", 'title' in script, f"Generated: {script.get('title', '')[:50]}...")
+                
+                # Step 3: Generate audio
+                tts_service = await tts_task
+                with tts_service.generate_audio(script) as audio_file:
+                    audio_size = audio_file.seek(0, 2)
+                    print_result("Audio generation", audio_size > 0, f"Generated {audio_size} bytes audio")
+                    
+                    # Step 4: Upload to storage
+                    storage_service = await storage_task
+                    # Uploads never overwrite, so a file left by an earlier failed run mustn't clash
+                    file_url = storage_service.upload_audio(audio_file, filename=f"test_e2e_{uuid.uuid4().hex}.mp3")
+                    print_result("Audio storage", file_url is not None, f"Uploaded to storage")
+                
+                # Cleanup
+                if file_url:
+                    storage_service.delete_audio(file_url)
+                    print_result("Workflow cleanup", True, "Test file removed")
+            finally:
+                # An earlier step may have failed before the background setup was awaited
+                for task in (tts_task, storage_task):
+                    task.cancel()
+                await asyncio.gather(tts_task, storage_task, return_exceptions=True)
+        
         app = create_app('development')
         with app.app_context():
-            # Step 1: Get papers
-            arxiv_service = ArxivService()
-            papers, total = arxiv_service.search_papers(topics=['machine learning'], max_results=1)
-            print_result("Paper retrieval", len(papers) > 0, f"Found {len(papers)} papers")
-            
-            # Step 2: Generate script
-            gemini_service = GeminiService()
-            script = gemini_service.generate_script(papers=papers[:1], target_length=5)
-            print_result("Script generation", 'title' in script, f"Generated: {script.get('title', '')[:50]}...")
-            
-            # Step 3: Generate audio
-            tts_service = TTSService()
-            audio_data = tts_service.generate_audio(script)
-            print_result("Audio generation", len(audio_data) > 0, f"Generated {len(audio_data)} bytes audio")
-            
-            # Step 4: Upload to storage
-            storage_service = StorageService()
-            file_url = storage_service.upload_audio(audio_data, filename="test_e2e.mp3")
-            print_result("Audio storage", file_url is not None, f"Uploaded to storage")
-            
-            # Cleanup
-            if file_url:
-                storage_service.delete_audio(file_url)
-                print_result("Workflow cleanup", True, "Test file removed")
+            # Worker threads inherit the app context through contextvars
+            asyncio.run(run_e2e())
             
             print("\n🎉 END-TO-END WORKFLOW SUCCESSFUL!")
             return True
@@ -175,6 +284,36 @@ def test_end_to_end_workflow():
         print_result("End-to-end workflow", False, str(e))
         return False
         
+async def _run_check(index, check):
+    """Await one service check, returning its position and whether it passed."""
+    try:
+        return index, (await check) is True
+    except Exception:
+        # An unexpected exception counts as a failed check
+        return index, False
+
+async def _run_all():
+    """
+    Run the independent service checks concurrently.
+    
+    With FIONN_FAIL_FAST=1 the remaining checks are cancelled as soon as one
+    fails; cancelled checks count as failed.
+    """
+    fail_fast = os.getenv('FIONN_FAIL_FAST') == '1'
+    checks = (check_tts(), check_storage(), check_gemini())
+    tasks = [asyncio.create_task(_run_check(i, check)) for i, check in enumerate(checks)]
+    
+    results = [False] * len(tasks)
+    for next_done in asyncio.as_completed(tasks):
+        index, ok = await next_done
+        results[index] = ok
+        if not ok and fail_fast:
+            print("\n⏹️  Fail-fast: cancelling the remaining service checks")
+            for task in tasks:
+                task.cancel()
+            break
+    return results
+
 def main():
     """Run all service tests"""
     load_dotenv()
@@ -182,10 +321,11 @@ def main():
     print("🚀 FIONNTAN SERVICES VALIDATION")
     print("Testing all external services for podcast generation...")
     
-    # Test individual services
-    tts_ok = test_tts()
-    storage_ok = test_storage()
-    gemini_ok = test_gemini()
+    # Connect the clients before the checks, so the first calls don't pay for setup
+    asyncio.run(_prewarm_clients())
+    
+    # Test individual services; they are independent network checks, so run them together
+    tts_ok, storage_ok, gemini_ok = asyncio.run(_run_all())
     
     # Test end-to-end workflow if all services work
     e2e_ok = False
@@ -1,9 +1,11 @@
 # tests/conftest.py
 
 import pytest
-import uuid
+import functools
+import itertools
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
+import io
 import sys
 import os
 import urllib.error # Added for HTTPError instantiation
@@ -15,17 +17,46 @@ if project_root not in sys.path:
 
 # Import app and db instance AFTER potentially modifying sys.path
 from app import create_app, db as flask_db_instance, celery as celery_app
-from app.models import User, UserPreference, Podcast, GenerationTask, PodcastScript, PodcastAudio
+from app.models import User, UserPreference
+from app.services import ArxivService, GeminiService, TTSService, StorageService
 from flask_jwt_extended import create_access_token, create_refresh_token
 
+# Users only need distinct ids, not random ones, and a fixed login time
+_USER_COUNTER = itertools.count()
+_FIXED_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Set at collection time: whether any selected test runs Celery tasks
+_CELERY_NEEDED = pytest.StashKey[bool]()
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "celery: the test runs Celery tasks (eagerly)")
+
+def pytest_collection_modifyitems(config, items):
+    config.stash[_CELERY_NEEDED] = any(item.get_closest_marker('celery') for item in items)
+
 # --- App and DB Fixtures ---
-@pytest.fixture(scope='session')
-def app():
-    """Create and configure a new app instance for the test session."""
+def _freeze(config):
+    """Turn a config dict into a hashable cache key."""
+    return tuple(sorted(config.items()))
+
+@functools.lru_cache(maxsize=None)
+def _cached_app(config_key):
+    """Build one app per distinct test config, so parametrized configs reuse it."""
     app_instance = create_app('testing')
+    app_instance.config.update(dict(config_key))
+    return app_instance
+
+@pytest.fixture(scope='session')
+def app(request):
+    """Create and configure a new app instance for the test session.
+
+    Safe to run under pytest-xdist (pytest -n auto): each worker process gets
+    its own in-memory database and in-memory Celery broker.
+    """
     test_config = {
         "TESTING": True,
-        "SQLALCHEMY_DATABASE_URI": os.environ.get('TEST_DATABASE_URL', "sqlite:///:memory:"),
+        # The database engine is already built from TestingConfig (which reads
+        # TEST_DATABASE_URL) by create_app, so it is not configured here
         "SQLALCHEMY_TRACK_MODIFICATIONS": False,
         "JWT_SECRET_KEY": "test-super-secret-key-for-testing",
         "SERVER_NAME": "localhost.test",
@@ -40,20 +71,27 @@ def app():
         "DEBUG": False, # Usually False for testing to mimic production more closely
         "PROPAGATE_EXCEPTIONS": True, # Helps in debugging test failures
     }
-    app_instance.config.update(test_config)
-
-    # Ensure Celery app is configured with test settings
-    celery_app.conf.update(
-        broker_url=app_instance.config['CELERY_BROKER_URL'],
-        result_backend=app_instance.config['CELERY_RESULT_BACKEND'],
-        task_always_eager=app_instance.config['CELERY_TASK_ALWAYS_EAGER'],
-        task_eager_propagates=app_instance.config['CELERY_TASK_EAGER_PROPAGATES']
-    )
-    return app_instance
+    app_instance = _cached_app(_freeze(test_config))
+
+    if request.config.stash.get(_CELERY_NEEDED, True):
+        # Ensure Celery app is configured with test settings
+        celery_app.conf.update(
+            broker_url=app_instance.config['CELERY_BROKER_URL'],
+            result_backend=app_instance.config['CELERY_RESULT_BACKEND'],
+            task_always_eager=app_instance.config['CELERY_TASK_ALWAYS_EAGER'],
+            task_eager_propagates=app_instance.config['CELERY_TASK_EAGER_PROPAGATES']
+        )
+        yield app_instance
+    else:
+        # No selected test runs tasks; make sure nothing reaches a real broker.
+        # Both patches are undone at session teardown.
+        with patch.dict(app_instance.config, {'CELERY_TASK_ALWAYS_EAGER': False}), \
+                patch.object(celery_app, 'send_task', MagicMock()):
+            yield app_instance
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='session')
 def db(app):
-    """Set up database tables for each test function using the app context."""
+    """Create the database tables once for the whole test session."""
     with app.app_context():
         flask_db_instance.create_all()
         yield flask_db_instance
@@ -61,15 +99,35 @@ def db(app):
         flask_db_instance.drop_all()
 
 @pytest.fixture(scope='function')
-def db_session(app, db):
-    """Provides a SQLAlchemy session scoped to a test function, managing a transaction."""
+def db_session(app, db, monkeypatch):
+    """Provides the app's SQLAlchemy session, bound to a transaction rolled back after the test.
+
+    For the test, the app's engine lookup returns one connection and
+    db.session is swapped for a session joining its transaction, so the
+    test, the views and eagerly run Celery tasks all share the same outer
+    transaction. Their commits only release a SAVEPOINT, and the outer
+    transaction is rolled back at teardown.
+    """
     with app.app_context():
         connection = db.engine.connect()
         transaction = connection.begin()
-        # Use a session that is bound to this connection and transaction
-        session = db.Session(bind=connection)
+        if connection.dialect.name == 'sqlite':
+            # pysqlite only emits BEGIN before DML, so a SAVEPOINT would start
+            # (and its release commit) a transaction of its own; open it here
+            monkeypatch.setattr(connection.connection.driver_connection, 'isolation_level', None)
+            connection.exec_driver_sql('BEGIN')
+        # Flask-SQLAlchemy sessions pick their bind from db.engines
+        monkeypatch.setitem(db.engines, None, connection)
+        # Objects stay loaded after commit; tests call expire_all() when they
+        # need to see what the app changed
+        session = db._make_scoped_session({
+            'join_transaction_mode': 'create_savepoint',
+            'expire_on_commit': False,
+        })
+        monkeypatch.setattr(db, 'session', session)
+
         yield session
-        session.close()
+        session.remove()
         transaction.rollback() # Ensure tests are isolated
         connection.close()
 
@@ -87,184 +145,170 @@ def runner(app):
 @pytest.fixture(scope='function')
 def test_user(db, db_session): # Changed scope to function for better isolation
     """Create and save a test user for each test. Ensures user_id is populated."""
-    unique_google_id = f"test-google-id-{uuid.uuid4()}"
+    unique_google_id = f"test-google-id-{next(_USER_COUNTER)}"
     user = User(
         email=f'{unique_google_id}@example.com',
         name='Test User',
         google_id=unique_google_id,
-        last_login=datetime.now(timezone.utc)
+        last_login=_FIXED_NOW
     )
     user_preferences = UserPreference(
         topics=['machine learning'],
         categories=['cs.AI'],
         authors=['Test Author'],
         max_results=10,
-        days_back=30,
-        sort_by='relevance'
+        days_back=30
+        # sort_by is left to the column default, 'relevance'
     )
     user.preferences = user_preferences
     db_session.add(user)
     db_session.commit() # Commit to get an ID
-    # It's crucial that the user object returned has its ID populated.
-    # db_session.refresh(user) # Ensure all attributes are up-to-date from DB
-    return db_session.get(User, user.id) # Return the user attached to the current session
+    # The session doesn't expire on commit, so the user is still loaded and attached
+    return user
 
 
+@pytest.fixture(scope='session')
+def _signed_tokens(app):
+    """JWTs signed by the session's app, keyed by (kind, user id).
+
+    A token only carries the user id, so it stays valid for any later test
+    user that reuses the id once the earlier test is rolled back.
+    """
+    return {}
+
+def _token_for(tokens, kind, user_id):
+    key = (kind, user_id)
+    if key not in tokens:
+        create = create_access_token if kind == 'access' else create_refresh_token
+        tokens[key] = create(identity=user_id)
+    return tokens[key]
+
+# test_user depends on db_session, whose app context stays pushed for the
+# whole test, so the token helpers below don't push one of their own
 @pytest.fixture
-def auth_headers(app, test_user):
+def auth_headers(test_user, _signed_tokens):
     """Create authentication headers for the test_user."""
-    with app.app_context():
-        if test_user is None or test_user.id is None:
-             pytest.fail("test_user fixture did not provide a committed user with an ID.")
-        access_token = create_access_token(identity=test_user.id)
+    if test_user is None or test_user.id is None:
+         pytest.fail("test_user fixture did not provide a committed user with an ID.")
+    access_token = _token_for(_signed_tokens, 'access', test_user.id)
     return {'Authorization': f'Bearer {access_token}'}
 
 @pytest.fixture
-def refresh_auth_headers(app, test_user):
-    with app.app_context():
-        if test_user is None or test_user.id is None:
-            pytest.fail("test_user fixture did not provide a committed user with an ID.")
-        refresh_token = create_refresh_token(identity=test_user.id)
+def refresh_auth_headers(test_user, _signed_tokens):
+    if test_user is None or test_user.id is None:
+        pytest.fail("test_user fixture did not provide a committed user with an ID.")
+    refresh_token = _token_for(_signed_tokens, 'refresh', test_user.id)
     return {'Authorization': f'Bearer {refresh_token}'}
 
 
 # --- Mock Service Fixtures with Failure Simulation Capability ---
+# Each mock is specced against the real service class and built once per
+# session; the function-scoped fixtures reset it and patch it in again for
+# every test. Tests simulate failures through the
+# methods' own side_effect, e.g. mock_tts_service.generate_audio.side_effect.
+
+# Canned arXiv results, returned by reference; tests only read them
+_MOCK_SEARCH_RETURN = ([{
+    'id': 'test-paper-1', 'title': 'Test Paper from Mock',
+    'authors': ['Mock Author'], 'abstract': 'Mock abstract content.',
+    'categories': ['cs.AI'], 'published': '2024-01-01',
+    'updated': '2024-01-01', 'url': 'http://example.com/test-paper-1',
+    'comment': 'A mock comment', 'primary_category': 'cs.AI'
+}], 1)
+_MOCK_PAPER_BY_ID = {
+    'id': 'test-paper-id-get', 'title': 'Specific Mock Paper by ID',
+    'authors': ['Mock Author Get'], 'abstract': 'Abstract for specific mock paper.',
+    'categories': ['cs.LG'], 'published': '2024-01-02',
+    'updated': '2024-01-02', 'url': 'http://example.com/test-paper-id-get',
+    'comment': 'Comment for specific paper get', 'primary_category': 'cs.LG'
+}
+
+# Canned TTS output shared by every test
+_MOCK_TTS_BYTES = b'mock e2e tts audio data'
+_MOCK_TTS_DURATION = 180
+
+def _reset_service_mock(mock_instance, return_values):
+    """Clear a shared service mock's calls and side effects and restore its return values."""
+    mock_instance.reset_mock(return_value=True, side_effect=True)
+    for name, value in return_values.items():
+        getattr(mock_instance, name).return_value = value
+
+def _patch_service(monkeypatch, app, service_cls, mock_instance):
+    """Make every construction of service_cls, and the app's shared instance, the mock."""
+    # Patching the class covers every module that imported it by name
+    monkeypatch.setattr(service_cls, '__new__', lambda cls, *args, **kwargs: mock_instance)
+    monkeypatch.setitem(app.extensions['services'], service_cls, mock_instance)
 
-@pytest.fixture
-def mock_arxiv_service(monkeypatch):
-    mock_instance = MagicMock()
-    mock_instance.search_papers_return_value = ([{
-        'id': 'test-paper-1', 'title': 'Test Paper from Mock',
-        'authors': ['Mock Author'], 'abstract': 'Mock abstract content.',
-        'categories': ['cs.AI'], 'published': '2024-01-01',
-        'updated': '2024-01-01', 'url': 'http://example.com/test-paper-1',
-        'comment': 'A mock comment', 'primary_category': 'cs.AI'
-    }], 1)
-    mock_instance.get_paper_by_id_return_value = {
-        'id': 'test-paper-id-get', 'title': 'Specific Mock Paper by ID',
-        'authors': ['Mock Author Get'], 'abstract': 'Abstract for specific mock paper.',
-        'categories': ['cs.LG'], 'published': '2024-01-02',
-        'updated': '2024-01-02', 'url': 'http://example.com/test-paper-id-get',
-        'comment': 'Comment for specific paper get', 'primary_category': 'cs.LG'
+@pytest.fixture(scope='session')
+def _mock_arxiv_factory():
+    mock_instance = MagicMock(spec=ArxivService)
+    return_values = {
+        'search_papers': _MOCK_SEARCH_RETURN,
+        'get_paper_by_id': _MOCK_PAPER_BY_ID,
+        'get_papers_by_ids': [_MOCK_PAPER_BY_ID]
     }
-    mock_instance.search_papers_side_effect = None
-    mock_instance.get_paper_by_id_side_effect = None
-
-    def mock_search_papers(*args, **kwargs):
-        if mock_instance.search_papers_side_effect:
-            effect = mock_instance.search_papers_side_effect
-            if callable(effect): # If it's a function, call it
-                 return effect(*args, **kwargs)
-            raise effect # Otherwise, raise it (it's an exception instance)
-        return mock_instance.search_papers_return_value
-
-    def mock_get_paper_by_id(*args, **kwargs):
-        if mock_instance.get_paper_by_id_side_effect:
-            effect = mock_instance.get_paper_by_id_side_effect
-            if callable(effect):
-                return effect(*args, **kwargs)
-            raise effect
-        # Simulate not found if a specific ID is requested to fail
-        if hasattr(mock_instance, 'fail_on_paper_id') and args[0] == mock_instance.fail_on_paper_id:
-            return None
-        return mock_instance.get_paper_by_id_return_value
-
-    mock_instance.search_papers = MagicMock(side_effect=mock_search_papers)
-    mock_instance.get_paper_by_id = MagicMock(side_effect=mock_get_paper_by_id)
-
-
-    def mock_constructor(*args, **kwargs):
-        return mock_instance
-
-    monkeypatch.setattr('app.services.arxiv_service.ArxivService', mock_constructor)
-    if 'app.tasks.podcast_tasks' in sys.modules and hasattr(sys.modules['app.tasks.podcast_tasks'], 'ArxivService'):
-        monkeypatch.setattr(sys.modules['app.tasks.podcast_tasks'], 'ArxivService', mock_constructor)
-    if 'app.api.arxiv' in sys.modules and hasattr(sys.modules['app.api.arxiv'], 'ArxivService'):
-        monkeypatch.setattr(sys.modules['app.api.arxiv'], 'ArxivService', mock_constructor)
-
-    return mock_instance
+    return mock_instance, return_values
 
 @pytest.fixture
-def mock_gemini_service(monkeypatch):
-    mock_instance = MagicMock()
-    mock_instance.generate_script_return_value = {
-        'title': 'Mock Script from E2E Gemini',
-        'sections': [{'title': 'E2E_INTRODUCTION', 'segments': [{'speaker': 'alex', 'text': 'E2E Mock intro from Gemini'}]}]
-    }
-    mock_instance.generate_script_side_effect = None
-
-    def mock_generate_script(*args, **kwargs):
-        if mock_instance.generate_script_side_effect:
-            effect = mock_instance.generate_script_side_effect
-            if callable(effect):
-                return effect(*args, **kwargs)
-            raise effect
-        return mock_instance.generate_script_return_value
-
-    mock_instance.generate_script = MagicMock(side_effect=mock_generate_script)
-
-    def mock_constructor(*args, **kwargs):
-        return mock_instance
+def mock_arxiv_service(monkeypatch, app, _mock_arxiv_factory):
+    mock_instance, return_values = _mock_arxiv_factory
+    _reset_service_mock(mock_instance, return_values)
 
-    monkeypatch.setattr('app.services.gemini_service.GeminiService', mock_constructor)
-    if 'app.tasks.podcast_tasks' in sys.modules and hasattr(sys.modules['app.tasks.podcast_tasks'], 'GeminiService'):
-        monkeypatch.setattr(sys.modules['app.tasks.podcast_tasks'], 'GeminiService', mock_constructor)
+    _patch_service(monkeypatch, app, ArxivService, mock_instance)
 
     return mock_instance
 
-@pytest.fixture
-def mock_tts_service(monkeypatch):
-    mock_instance = MagicMock()
-    mock_instance.generate_audio_return_value = b'mock e2e tts audio data'
-    mock_instance.get_audio_duration_return_value = 180
-    mock_instance.generate_audio_side_effect = None # To allow simulating errors
-
-    def mock_generate_audio(*args, **kwargs):
-        if mock_instance.generate_audio_side_effect:
-            effect = mock_instance.generate_audio_side_effect
-            if callable(effect): # If it's a function, call it
-                 return effect(*args, **kwargs)
-            raise effect # Otherwise, raise it (it's an exception instance)
-        return mock_instance.generate_audio_return_value
-
-    mock_instance.generate_audio = MagicMock(side_effect=mock_generate_audio)
-    mock_instance.get_audio_duration = MagicMock(return_value=mock_instance.get_audio_duration_return_value)
-
+@pytest.fixture(scope='session')
+def _mock_gemini_factory():
+    mock_instance = MagicMock(spec=GeminiService)
+    return_values = {
+        'generate_script': {
+            'title': 'Mock Script from E2E Gemini',
+            'sections': [{'title': 'E2E_INTRODUCTION', 'segments': [{'speaker': 'alex', 'text': 'E2E Mock intro from Gemini'}]}]
+        }
+    }
+    return mock_instance, return_values
 
-    def mock_constructor(*args, **kwargs):
-        return mock_instance
+@pytest.fixture
+def mock_gemini_service(monkeypatch, app, _mock_gemini_factory):
+    mock_instance, return_values = _mock_gemini_factory
+    _reset_service_mock(mock_instance, return_values)
 
-    monkeypatch.setattr('app.services.tts_service.TTSService', mock_constructor)
-    if 'app.tasks.podcast_tasks' in sys.modules and hasattr(sys.modules['app.tasks.podcast_tasks'], 'TTSService'):
-        monkeypatch.setattr(sys.modules['app.tasks.podcast_tasks'], 'TTSService', mock_constructor)
+    _patch_service(monkeypatch, app, GeminiService, mock_instance)
 
     return mock_instance
 
-@pytest.fixture
-def mock_storage_service(monkeypatch):
-    mock_instance = MagicMock()
-    mock_instance.upload_audio_return_value = 'https://fake.storage.com/podcast_e2e_test.mp3'
-    mock_instance.download_audio_return_value = '/tmp/mock_e2e_downloaded_audio.mp3'
-    mock_instance.upload_audio_side_effect = None # To allow simulating errors
+@pytest.fixture(scope='session')
+def _mock_tts_factory():
+    mock_instance = MagicMock(spec=TTSService)
+    return_values = {'get_audio_duration': _MOCK_TTS_DURATION}
+    return mock_instance, return_values
 
+@pytest.fixture
+def mock_tts_service(monkeypatch, app, _mock_tts_factory):
+    mock_instance, return_values = _mock_tts_factory
+    _reset_service_mock(mock_instance, return_values)
+    # The audio task closes the file it gets, so each test needs a fresh one
+    mock_instance.generate_audio.return_value = io.BytesIO(_MOCK_TTS_BYTES)
 
-    def mock_upload_audio(*args, **kwargs):
-        if mock_instance.upload_audio_side_effect:
-            effect = mock_instance.upload_audio_side_effect
-            if callable(effect):
-                 return effect(*args, **kwargs)
-            raise effect
-        return mock_instance.upload_audio_return_value
+    _patch_service(monkeypatch, app, TTSService, mock_instance)
 
-    mock_instance.upload_audio = MagicMock(side_effect=mock_upload_audio)
-    mock_instance.download_audio = MagicMock(return_value=mock_instance.download_audio_return_value)
+    return mock_instance
 
+@pytest.fixture(scope='session')
+def _mock_storage_factory():
+    mock_instance = MagicMock(spec=StorageService)
+    return_values = {
+        'upload_audio': 'https://fake.storage.com/podcast_e2e_test.mp3',
+        'download_audio': '/tmp/mock_e2e_downloaded_audio.mp3'
+    }
+    return mock_instance, return_values
 
-    def mock_constructor(*args, **kwargs):
-        return mock_instance
+@pytest.fixture
+def mock_storage_service(monkeypatch, app, _mock_storage_factory):
+    mock_instance, return_values = _mock_storage_factory
+    _reset_service_mock(mock_instance, return_values)
 
-    monkeypatch.setattr('app.services.storage_service.StorageService', mock_constructor)
-    if 'app.tasks.podcast_tasks' in sys.modules and hasattr(sys.modules['app.tasks.podcast_tasks'], 'StorageService'):
-        monkeypatch.setattr(sys.modules['app.tasks.podcast_tasks'], 'StorageService', mock_constructor)
+    _patch_service(monkeypatch, app, StorageService, mock_instance)
 
-    return mock_instance
\ No newline at end of file
+    return mock_instance
@@ -0,0 +1,263 @@
+# tests/test_arxiv_scraper.py
+import asyncio
+import dataclasses
+import itertools
+import os
+import time
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.arxiv_scraper import ArXivScraper, TokenBucket, UserPreferences
+
+# --- Test Doubles ---
+def _paper(paper_id):
+    return {"id": paper_id, "title": f"Paper {paper_id}"}
+
+class FakeFetch:
+    """Stand-in for ArXivScraper._fetch_page serving `total` papers per query."""
+
+    def __init__(self, total, hang_after=None):
+        self.total = total
+        self.hang_after = hang_after  # Pages starting at or past this offset never finish
+        self.calls = []
+        self.sessions = []
+        self.cancelled = []
+
+    async def __call__(self, session, semaphore, query, start, page_size):
+        self.calls.append((query, start, page_size))
+        self.sessions.append(session)
+        if self.hang_after is not None and start >= self.hang_after:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                self.cancelled.append(start)
+                raise
+        tag = abs(hash(query)) % 10000
+        return [_paper(f"{tag:04d}.{i:05d}v1") for i in range(start, min(start + page_size, self.total))]
+
+def _atom_feed():
+    return b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <entry>
+    <id>http://arxiv.org/abs/2301.00001v2</id>
+    <updated>2023-01-02T00:00:00Z</updated>
+    <published>2023-01-01T00:00:00Z</published>
+    <title>A   Long
+      Title</title>
+    <summary>  Abstract text  </summary>
+    <author><name>Author One</name></author>
+    <author><name>Author Two</name></author>
+    <link title="pdf" href="http://arxiv.org/pdf/2301.00001v2" rel="related" type="application/pdf"/>
+    <arxiv:comment>10 pages</arxiv:comment>
+    <category term="cs.AI"/>
+    <category term="cs.LG"/>
+  </entry>
+</feed>"""
+
+# --- Pytest Fixtures ---
+@pytest.fixture
+def make_scraper(tmp_path):
+    """Build scrapers caching under tmp_path and close them at teardown."""
+    scrapers = []
+
+    def make(**prefs):
+        prefs.setdefault("topics", ["AI"])
+        scraper = ArXivScraper(UserPreferences(**prefs))
+        scrapers.append(scraper)
+        return scraper
+
+    with patch.object(ArXivScraper, "CACHE_DIR", str(tmp_path)):
+        yield make
+    for scraper in scrapers:
+        scraper.close()
+
+def _patch_fetch(fake):
+    return patch.object(ArXivScraper, "_fetch_page", fake)
+
+# --- Tests for UserPreferences ---
+def test_user_preferences_are_frozen_and_hashable():
+    prefs = UserPreferences(topics=["AI"], categories=["cs.AI"])
+
+    assert prefs.topics == ("AI",)
+    assert prefs.categories == ("cs.AI",)
+    assert hash(prefs) == hash(UserPreferences(topics=("AI",), categories=("cs.AI",)))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        prefs.max_results = 10
+
+# --- Tests for rate-limit backoff ---
+@patch("app.arxiv_scraper.asyncio.sleep", new_callable=AsyncMock)
+@patch("app.arxiv_scraper.random.uniform", side_effect=lambda low, high: high)
+def test_rate_limit_backoff_draws_from_full_window(mock_uniform, mock_sleep, make_scraper):
+    scraper = make_scraper()
+    for retries in (1, 3, 5):
+        asyncio.run(scraper._handle_rate_limit(retries))
+
+    assert [c.args for c in mock_uniform.call_args_list] == [(0, 2), (0, 8), (0, 32)]
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [2, 8, 32]
+
+@patch("app.arxiv_scraper.asyncio.sleep", new_callable=AsyncMock)
+def test_rate_limit_backoff_gives_up_after_max_retries(mock_sleep, make_scraper):
+    scraper = make_scraper()
+
+    with pytest.raises(Exception, match="Rate limiting could not be resolved"):
+        asyncio.run(scraper._handle_rate_limit(6))
+    mock_sleep.assert_not_awaited()
+
+# --- Tests for TokenBucket ---
+def test_token_bucket_reserves_successive_slots():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket._reserve() == pytest.approx(0.2, abs=0.01)
+
+@patch("app.arxiv_scraper.asyncio.sleep", new_callable=AsyncMock)
+def test_token_bucket_acquire_sleeps_only_when_empty(mock_sleep):
+    bucket = TokenBucket(rate=1, capacity=1)
+
+    asyncio.run(bucket.acquire())
+    mock_sleep.assert_not_awaited()
+    asyncio.run(bucket.acquire())
+    mock_sleep.assert_awaited_once()
+    assert mock_sleep.call_args.args[0] == pytest.approx(1, abs=0.05)
+
+# --- Tests for parsing and deduplication ---
+def test_parse_feed_output_shape(make_scraper):
+    papers = make_scraper()._parse_feed(_atom_feed())
+
+    assert papers == [{
+        "id": "2301.00001v2",
+        "title": "A Long Title",
+        "authors": ["Author One", "Author Two"],
+        "abstract": "Abstract text",
+        "pdf_url": "http://arxiv.org/pdf/2301.00001v2",
+        "categories": ["cs.AI", "cs.LG"],
+        "published": "2023-01-01",
+        "updated": "2023-01-02",
+        "url": "http://arxiv.org/abs/2301.00001v2",
+        "comment": "10 pages",
+    }]
+
+def test_unique_papers_ignores_version_suffix():
+    pages = [[_paper("2301.00001v1"), _paper("2301.00002v1")],
+             [_paper("2301.00001v2"), _paper("2301.00003v1")]]
+
+    ids = [p["id"] for p in ArXivScraper._unique_papers(pages)]
+    assert ids == ["2301.00001v1", "2301.00002v1", "2301.00003v1"]
+
+# --- Tests for paging ---
+def test_search_papers_requests_every_page_in_order(make_scraper):
+    fake = FakeFetch(total=1000)
+    with _patch_fetch(fake):
+        papers = make_scraper(max_results=250).search_papers()
+
+    assert [(start, size) for _, start, size in fake.calls] == [(0, 100), (100, 100), (200, 50)]
+    assert [p["id"][5:10] for p in papers] == [f"{i:05d}" for i in range(250)]
+
+def test_iter_papers_stops_after_short_page(make_scraper):
+    fake = FakeFetch(total=250)
+    with _patch_fetch(fake):
+        papers = make_scraper(max_results=1000).search_papers()
+
+    assert len(papers) == 250
+    # Pages already read ahead of the short page at 200 were requested, but nothing after it
+    starts = [start for _, start, _ in fake.calls]
+    assert starts == [0, 100, 200, 300, 400, 500]
+
+def test_iter_papers_cancels_read_ahead_when_consumer_stops(make_scraper, tmp_path):
+    fake = FakeFetch(total=1000, hang_after=100)
+    scraper = make_scraper(max_results=1000)
+    with _patch_fetch(fake):
+        papers = scraper.iter_papers()
+        first = list(itertools.islice(papers, 5))
+        papers.close()
+
+    assert len(first) == 5
+    read_ahead = [100 * i for i in range(1, ArXivScraper.MAX_CONCURRENT_PAGES)]
+    assert sorted(fake.cancelled) == read_ahead
+    assert len(fake.calls) == ArXivScraper.MAX_CONCURRENT_PAGES
+    # An abandoned search is never cached
+    assert os.listdir(tmp_path) == []
+
+# --- Tests for the pooled session ---
+def test_searches_share_one_pooled_session(make_scraper):
+    fake = FakeFetch(total=30)
+    scraper = make_scraper()
+    with _patch_fetch(fake):
+        scraper.search_papers()
+        scraper.search_papers(force_refresh=True)
+
+    first, second = fake.sessions
+    assert first is second
+    scraper.close()
+    assert first.closed
+
+# --- Tests for the on-disk cache ---
+def test_search_papers_served_from_cache(make_scraper):
+    fake = FakeFetch(total=30)
+    with _patch_fetch(fake):
+        first = make_scraper(max_results=50).search_papers()
+        second = make_scraper(max_results=50).search_papers()
+
+    assert second == first
+    assert len(fake.calls) == 1
+
+def test_search_papers_async_shares_cache_with_iter_papers(make_scraper):
+    fake = FakeFetch(total=30)
+    with _patch_fetch(fake):
+        scraper = make_scraper(max_results=50)
+        first = scraper._run(scraper.search_papers_async())
+        second = make_scraper(max_results=50).search_papers()
+
+    assert second == first
+    assert len(fake.calls) == 1
+
+def test_search_papers_refetches_expired_cache(make_scraper, tmp_path):
+    fake = FakeFetch(total=30)
+    with _patch_fetch(fake):
+        make_scraper().search_papers()
+        cache_file, = tmp_path.iterdir()
+        expired = time.time() - ArXivScraper.CACHE_TTL_SECONDS - 1
+        os.utime(cache_file, (expired, expired))
+
+        make_scraper().search_papers()
+
+    assert len(fake.calls) == 2
+    assert cache_file.stat().st_mtime > expired
+
+def test_search_papers_prunes_expired_cache_files(make_scraper, tmp_path):
+    stale = tmp_path / "stale.json"
+    stale.write_text("[]")
+    expired = time.time() - ArXivScraper.CACHE_TTL_SECONDS - 1
+    os.utime(stale, (expired, expired))
+
+    with _patch_fetch(FakeFetch(total=30)):
+        make_scraper().search_papers()
+
+    assert not stale.exists()
+    assert len(list(tmp_path.iterdir())) == 1
+
+def test_search_papers_force_refresh_skips_cache(make_scraper):
+    fake = FakeFetch(total=30)
+    with _patch_fetch(fake):
+        make_scraper().search_papers()
+        make_scraper().search_papers(force_refresh=True)
+
+    assert len(fake.calls) == 2
+
+# --- Tests for batch downloads ---
+def test_download_batches_returns_results_in_spec_order(make_scraper):
+    fake = FakeFetch(total=3)
+    scraper = make_scraper()
+    with _patch_fetch(fake):
+        results = scraper._run(scraper.download_batches([
+            (["vision"], None, None),
+            (["language"], ["cs.CL"], None),
+        ]))
+
+    assert [len(papers) for papers in results] == [3, 3]
+    assert "all:vision" in fake.calls[0][0] or "all:vision" in fake.calls[1][0]
+    assert results[0] != results[1]
+    # Batches share the parent's pooled session
+    assert len(fake.calls) == 2
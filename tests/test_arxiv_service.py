@@ -1,72 +1,102 @@
 # tests/test_arxiv_service.py
+import asyncio
+import os
 import pytest
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock, AsyncMock, call
 from datetime import datetime, timedelta
-import arxiv # For the original arxiv.Client and arxiv.HTTPError
+from types import SimpleNamespace
 import urllib.error # For instantiating HTTPError correctly
+import aiohttp
+import requests
+
+from app.services.arxiv_service import ArxivService, _RequestPacer, _cached_query
+from app.services.disk_cache import DiskCache
+
+# The unpatched fetch, for tests of the HTTP layer itself
+_real_fetch_feed = ArxivService._fetch_feed
+
+# --- Test Doubles ---
+def make_result(entry_id, title="t", summary="s", authors=("Author Default",), **kw):
+    """Build a plain stand-in for an arxiv.Result, with authors that only carry a name."""
+    return SimpleNamespace(
+        entry_id=entry_id, title=title, summary=summary,
+        authors=[SimpleNamespace(name=name) for name in authors],
+        categories=kw.get("categories", ["cs.AI"]),
+        pdf_url=kw.get("pdf_url", f"http://arxiv.org/pdf/{entry_id.rpartition('/')[2]}.pdf"),
+        published=kw.get("published", datetime(2023, 1, 1)),
+        updated=kw.get("updated", datetime(2023, 1, 2)),
+        comment=kw.get("comment", "No comments"),
+        primary_category=kw.get("primary_category", "cs.AI"),
+        get_short_id=lambda: _short_id(entry_id),
+    )
+
+def _short_id(entry_id):
+    _, sep, tail = entry_id.rpartition('/abs/')
+    return tail if sep else entry_id.rpartition('/')[2]
+
+def _atom_feed(*paper_ids):
+    """Build a minimal arXiv Atom feed containing the given papers."""
+    entries = "".join(f"""
+  <entry>
+    <id>http://arxiv.org/abs/{paper_id}</id>
+    <updated>2023-01-02T00:00:00Z</updated>
+    <published>2023-01-01T00:00:00Z</published>
+    <title>Paper {paper_id}</title>
+    <summary>Abstract {paper_id}</summary>
+    <author><name>Author One</name></author>
+    <link title="pdf" href="http://arxiv.org/pdf/{paper_id}" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="cs.AI"/>
+    <category term="cs.AI"/>
+  </entry>""" for paper_id in paper_ids)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">{entries}
+</feed>""".encode()
+
+# --- Pytest Fixtures ---
+@pytest.fixture(scope="module")
+def _patched_arxiv():
+    """Patch the HTTP fetch once per module and share one service across its tests."""
+    mock_fetch = AsyncMock(return_value=_atom_feed())
+    with patch.object(ArxivService, "_fetch_feed", mock_fetch), \
+            patch.object(ArxivService.RATE_LIMITER, "interval", 0):
+        yield ArxivService(), mock_fetch
+
+@pytest.fixture
+def arxiv_service(_patched_arxiv):
+    """The shared ArxivService; tests that replace its attributes build their own."""
+    return _patched_arxiv[0]
 
-from app.services.arxiv_service import ArxivService
-
-# Store a reference to the original arxiv.Client BEFORE any patching
-OriginalArxivClient = arxiv.Client
-
-# --- Helper Mock Class ---
-class MockArxivResult:
-    def __init__(self, entry_id_url, title, summary, authors_mocks=None, categories=None, pdf_url=None, published=None, updated=None, comment=None, primary_category=None):
-        self.entry_id = entry_id_url
-        self.title = title
-        self.summary = summary
-        if authors_mocks is None:
-            author_default_mock = MagicMock()
-            author_default_mock.name = "Author Default"
-            self.authors = [author_default_mock]
-        else:
-            self.authors = authors_mocks
-        self.categories = categories or ["cs.AI"]
-        self.pdf_url = pdf_url or f"http://arxiv.org/pdf/{entry_id_url.split('/')[-1]}.pdf"
-        self.published = published or datetime(2023, 1, 1)
-        self.updated = updated or datetime(2023, 1, 2)
-        self.comment = comment or "No comments"
-        self.primary_category = primary_category or "cs.AI"
-
-    def get_short_id(self):
-        if '/abs/' in self.entry_id:
-            return self.entry_id.split('/abs/')[1]
-        return self.entry_id.split('/')[-1]
-
-# --- Pytest Fixture ---
 @pytest.fixture
-def mock_arxiv_client():
-    """Fixture to mock the arxiv.Client for ArxivService."""
-    with patch('arxiv.Client', spec=OriginalArxivClient) as mock_client_constructor:
-        mock_instance = MagicMock(spec=OriginalArxivClient)
-        mock_instance.results.return_value = iter([])
-        mock_client_constructor.return_value = mock_instance
-        yield mock_instance
+def reset_arxiv_mock(_patched_arxiv):
+    """The shared fetch mock, cleared and answering with an empty feed."""
+    mock_fetch = _patched_arxiv[1]
+    mock_fetch.reset_mock(return_value=True, side_effect=True)
+    mock_fetch.return_value = _atom_feed()
+    return mock_fetch
 
 # --- Test Functions ---
 
-def test_arxiv_service_initialization(mock_arxiv_client):
-    service = ArxivService()
-    assert service.client is mock_arxiv_client
-
-def test_search_papers_basic(mock_arxiv_client):
-    mock_paper_1_id_url = "http://arxiv.org/abs/2301.00001v1"
-    mock_paper_2_id_url = "http://arxiv.org/abs/2301.00002v1"
-    mock_results_data = [
-        MockArxivResult(entry_id_url=mock_paper_1_id_url, title="Test Paper 1", summary="Abstract 1"),
-        MockArxivResult(entry_id_url=mock_paper_2_id_url, title="Test Paper 2", summary="Abstract 2"),
-    ]
-    mock_arxiv_client.results.return_value = iter(mock_results_data)
+def test_arxiv_service_initialization(arxiv_service, reset_arxiv_mock):
+    assert isinstance(arxiv_service.session, requests.Session)
 
-    service = ArxivService()
-    papers, total = service.search_papers(topics=["AI"], max_results=2)
+def test_search_papers_basic(arxiv_service, reset_arxiv_mock):
+    reset_arxiv_mock.return_value = _atom_feed("2301.00001v1", "2301.00002v1")
+    papers, total = arxiv_service.search_papers(topics=["AI"], max_results=2)
 
     assert len(papers) == 2
     assert total == 2
-    assert papers[0]["title"] == "Test Paper 1"
+    assert papers[0]["title"] == "Paper 2301.00001v1"
     assert papers[0]["id"] == "2301.00001v1"
-    mock_arxiv_client.results.assert_called_once()
+    reset_arxiv_mock.assert_awaited_once()
+    params = reset_arxiv_mock.call_args.args[1]
+    assert params["start"] == 0
+    assert params["max_results"] == 2
+
+def test_search_papers_fetches_pages_concurrently(arxiv_service, reset_arxiv_mock):
+    arxiv_service.search_papers(topics=["AI"], max_results=250)
+
+    pages = sorted((c.args[1]["start"], c.args[1]["max_results"]) for c in reset_arxiv_mock.call_args_list)
+    assert pages == [(0, 100), (100, 100), (200, 50)]
 
 # --- Tests for _build_search_query ---
 def test_build_search_query_only_topics():
@@ -157,135 +187,319 @@ def test_build_search_query_only_days_back():
     assert "all:" not in query
     assert "AND" not in query
 
+def test_build_search_query_cached_reuse():
+    service = ArxivService()
+    service._build_search_query(topics=["cached1", "cached2"], days_back=7)
+    hits = _cached_query.cache_info().hits
+
+    query = service._build_search_query(topics=["cached2", "cached1"], days_back=7)
+
+    assert _cached_query.cache_info().hits == hits + 1
+    assert query.startswith("(all:cached1 OR all:cached2)")
+
+
 
 # --- Tests for _handle_rate_limit_internally ---
-@patch('time.sleep') # Mock time.sleep to avoid actual delays
-def test_handle_rate_limit_internally_success_after_retries(mock_sleep, mock_arxiv_client):
+def _probe_response(status_code):
+    """Build a fake response for the HEAD rate-limit probe."""
+    response = MagicMock(status_code=status_code)
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"{status_code} Error", response=response)
+    return response
+
+@patch('asyncio.sleep', new_callable=AsyncMock) # Mock asyncio.sleep to avoid actual delays
+def test_handle_rate_limit_internally_success_after_retries(mock_sleep, reset_arxiv_mock):
     service = ArxivService()
     service.rate_limit_max_retries_internal = 2 # loop for i=0, 1
-    mock_arxiv_client.results.side_effect = [
-        urllib.error.HTTPError('url', 429, 'msg', {}, None), # Fails for ping attempt when i=0
-        iter([MockArxivResult(entry_id_url="http://arxiv.org/abs/id_test", title="t", summary="s")]) # Succeeds for ping attempt when i=1
+    service.session = MagicMock()
+    service.session.head.side_effect = [
+        _probe_response(429), # Still limited for probe attempt when i=0
+        _probe_response(200)  # Lifted for probe attempt when i=1
     ]
-    service.client = mock_arxiv_client
 
-    service._handle_rate_limit_internally() 
+    asyncio.run(service._handle_rate_limit_internally()) 
 
     assert mock_sleep.call_count == service.rate_limit_max_retries_internal # Sleep is called for each retry attempt
-    assert mock_arxiv_client.results.call_count == 2 # First failing ping, second successful ping
+    assert service.session.head.call_count == 2 # First limited probe, second successful probe
+    reset_arxiv_mock.assert_not_called() # Probing never runs a real search
 
 
-@patch('time.sleep')
-def test_handle_rate_limit_internally_fails_after_max_retries(mock_sleep, mock_arxiv_client):
+@patch('asyncio.sleep', new_callable=AsyncMock)
+def test_handle_rate_limit_internally_fails_after_max_retries(mock_sleep, reset_arxiv_mock):
     service = ArxivService()
     service.rate_limit_max_retries_internal = 2
-    mock_arxiv_client.results.side_effect = urllib.error.HTTPError('url', 429, 'msg for test', {}, None)
-    service.client = mock_arxiv_client
+    service.session = MagicMock()
+    service.session.head.side_effect = lambda *args, **kwargs: _probe_response(429)
 
     with pytest.raises(urllib.error.HTTPError) as excinfo:
-        service._handle_rate_limit_internally()
+        asyncio.run(service._handle_rate_limit_internally())
 
     assert excinfo.value.code == 429
     assert "Failed to recover from rate limiting after internal retries." in str(excinfo.value.reason)
     assert mock_sleep.call_count == service.rate_limit_max_retries_internal
-    assert mock_arxiv_client.results.call_count == service.rate_limit_max_retries_internal
+    assert service.session.head.call_count == service.rate_limit_max_retries_internal
 
-@patch('time.sleep')
-def test_handle_rate_limit_internally_non_429_error(mock_sleep, mock_arxiv_client):
+@patch('asyncio.sleep', new_callable=AsyncMock)
+def test_handle_rate_limit_internally_non_429_error(mock_sleep, reset_arxiv_mock):
     service = ArxivService()
-    mock_arxiv_client.results.side_effect = urllib.error.HTTPError('url', 500, 'Internal Server Error', {}, None)
-    service.client = mock_arxiv_client
+    service.session = MagicMock()
+    service.session.head.return_value = _probe_response(500)
 
-    with pytest.raises(urllib.error.HTTPError) as excinfo:
-        service._handle_rate_limit_internally()
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(service._handle_rate_limit_internally())
 
-    assert excinfo.value.code == 500
-    assert mock_sleep.call_count == 1 # Sleep occurs once before the first ping
-    assert mock_arxiv_client.results.call_count == 1
+    assert mock_sleep.call_count == 1 # Sleep occurs once before the first probe
+    assert service.session.head.call_count == 1
 
-@patch('time.sleep')
-def test_search_papers_invokes_internal_rate_handler(mock_sleep, mock_arxiv_client):
-    service = ArxivService()
-    http_error_429 = urllib.error.HTTPError('http://example.com/api', 429, 'Rate limit exceeded', {}, None)
-    mock_paper = MockArxivResult(entry_id_url="http://arxiv.org/abs/success/123", title="Success Paper", summary="Content")
-    service.rate_limit_max_retries_internal = 1
-
-    mock_arxiv_client.results.side_effect = [
-        http_error_429,
-        iter([mock_paper]),
-        iter([mock_paper])
-    ]
-    service.client = mock_arxiv_client
+def test_search_papers_invokes_internal_rate_handler(arxiv_service, reset_arxiv_mock):
+    http_error_429 = aiohttp.ClientResponseError(MagicMock(), (), status=429, message='Rate limit exceeded')
+    reset_arxiv_mock.side_effect = [http_error_429, _atom_feed("success/123")]
+
+    with patch.object(arxiv_service, "_handle_rate_limit_internally", new_callable=AsyncMock) as mock_handler:
+        papers, total = arxiv_service.search_papers(topics=["test"])
 
-    papers, total = service.search_papers(topics=["test"])
     assert len(papers) == 1
-    assert papers[0]['title'] == "Success Paper"
-    assert mock_sleep.call_count == 1
-    assert mock_arxiv_client.results.call_count == 3
+    assert papers[0]['title'] == "Paper success/123"
+    mock_handler.assert_awaited_once()
+    assert reset_arxiv_mock.await_count == 2
 
 
-def test_get_paper_by_id_found(mock_arxiv_client):
-    paper_id_short_form = "2305.00001v1"
-    mock_paper_url = f"http://arxiv.org/abs/{paper_id_short_form}"
-    mock_paper = MockArxivResult(entry_id_url=mock_paper_url, title="Specific Paper", summary="Specific abstract.")
-    mock_arxiv_client.results.return_value = iter([mock_paper])
+def _feed_session(status, body=b"", headers=None):
+    """Build a fake aiohttp session whose GET answers with the given response."""
+    response = MagicMock(status=status, headers=headers or {})
+    response.read = AsyncMock(return_value=body)
+    session = MagicMock()
+    session.get.return_value.__aenter__.return_value = response
+    return session
+
+def test_cache_revalidation(tmp_path):
+    service = ArxivService()
+    service.cache = DiskCache(str(tmp_path), 10 ** 6, suffix=".feed")
+    params = {"id_list": "2305.00001v1"}
+    feed = _atom_feed("2305.00001v1")
+
+    first = _feed_session(200, feed, {"ETag": '"v1"'})
+    assert asyncio.run(_real_fetch_feed(service, first, params)) == feed
+    assert first.get.call_args.kwargs["headers"] == {}
+
+    revalidated = _feed_session(304)
+    assert asyncio.run(_real_fetch_feed(service, revalidated, params)) == feed
+    assert revalidated.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    revalidated.get.return_value.__aenter__.return_value.read.assert_not_awaited()
+
+
+def test_cache_evicts_least_recently_used_feeds(tmp_path):
     service = ArxivService()
-    paper = service.get_paper_by_id(paper_id_short_form)
+    feed = _atom_feed("2305.00001v1")
+    keys = [service._cache_key({"id_list": str(n)}) for n in range(3)]
+    service.cache = DiskCache(str(tmp_path), 10 ** 6, suffix=".feed")
+    for n, key in enumerate(keys[:2]):
+        service._write_cache(key, feed, '"v1"', None)
+        os.utime(service.cache.path(key), (n, n))
+    service._read_cache(keys[0]) # Reading makes the oldest entry the most recent
+
+    # The third write goes over the limit, and evicting one entry gets under 90% of it
+    service.cache.max_bytes = int(2.5 * os.path.getsize(service.cache.path(keys[0])))
+    service._write_cache(keys[2], feed, None, 'Mon, 01 Jan 2024 00:00:00 GMT')
+
+    assert service._read_cache(keys[1]) is None
+    assert service._read_cache(keys[0]) == ({"etag": '"v1"', "last_modified": None}, feed)
+    assert service._read_cache(keys[2])[1] == feed
+
+
+def test_get_paper_by_id_found(arxiv_service, reset_arxiv_mock):
+    paper_id_short_form = "2305.00001v1"
+    reset_arxiv_mock.return_value = _atom_feed(paper_id_short_form)
+    paper = arxiv_service.get_paper_by_id(paper_id_short_form)
     assert paper is not None
     assert paper["id"] == paper_id_short_form
-    search_instance_arg = mock_arxiv_client.results.call_args[0][0]
-    assert search_instance_arg.id_list == [paper_id_short_form]
+    assert reset_arxiv_mock.call_args.args[1] == {"id_list": paper_id_short_form, "max_results": 1}
 
-def test_get_paper_by_id_not_found(mock_arxiv_client):
-    mock_arxiv_client.results.return_value = iter([])
-    service = ArxivService()
-    paper = service.get_paper_by_id("nonexistent.id")
+def test_get_paper_by_id_not_found(arxiv_service, reset_arxiv_mock):
+    paper = arxiv_service.get_paper_by_id("nonexistent.id")
     assert paper is None
 
+def test_get_papers_by_ids_batch(arxiv_service, reset_arxiv_mock):
+    ids = [f"2305.{n:05d}v1" for n in range(50)]
+    reset_arxiv_mock.return_value = _atom_feed(*ids)
+
+    papers = arxiv_service.get_papers_by_ids(ids)
+
+    assert [paper["id"] for paper in papers] == ids
+    reset_arxiv_mock.assert_awaited_once()
+    assert reset_arxiv_mock.call_args.args[1] == {"id_list": ",".join(ids), "max_results": 50}
+
+
+def test_get_papers_by_ids_skips_ids_that_fail_the_batch(arxiv_service, reset_arxiv_mock):
+    ids = ["2305.00001v1", "not-an-id", "2305.00002v1"]
+
+    async def fake_fetch(session, params):
+        if "not-an-id" in params["id_list"]:
+            raise aiohttp.ClientResponseError(MagicMock(), (), status=400, message="Bad Request")
+        return _atom_feed(*params["id_list"].split(","))
+
+    reset_arxiv_mock.side_effect = fake_fetch
+    papers = arxiv_service.get_papers_by_ids(ids)
+
+    assert [paper["id"] for paper in papers] == ["2305.00001v1", "2305.00002v1"]
+    # The rejected batch, then one request per ID
+    assert reset_arxiv_mock.await_count == 1 + len(ids)
+
+
 def test_process_paper():
     service = ArxivService()
     now = datetime.now()
-    author_mock1 = MagicMock()
-    author_mock1.name = "Author One"
-    author_mock2 = MagicMock()
-    author_mock2.name = "Author Two"
-    mock_api_result = MockArxivResult(
-        entry_id_url="http://arxiv.org/abs/cs/0102003v1", title="Test Title",
-        summary="This is a test abstract.", authors_mocks=[author_mock1, author_mock2],
+    mock_api_result = make_result(
+        entry_id="http://arxiv.org/abs/cs/0102003v1", title="Test Title",
+        summary="This is a test abstract.", authors=("Author One", "Author Two"),
         categories=["cs.AI", "cs.LG"], pdf_url="http://arxiv.org/pdf/cs/0102003v1.pdf",
         published=now - timedelta(days=5), updated=now - timedelta(days=2),
         comment="A test comment.", primary_category="cs.AI"
     )
     processed = service._process_paper(mock_api_result)
     assert processed["id"] == "cs/0102003v1"
-    assert processed["authors"] == ["Author One", "Author Two"]
+    assert processed["authors"] == ("Author One", "Author Two")
     assert processed["title"] == "Test Title"
     assert processed["primary_category"] == "cs.AI"
 
 
-def test_search_papers_sort_by_preference(mock_arxiv_client):
+def test_parse_feed_from_xml():
+    body = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>ArXiv Query</title>
+  <entry>
+    <id>http://arxiv.org/abs/cs/0102003v1</id>
+    <updated>2001-02-05T12:30:00Z</updated>
+    <published>2001-02-03T09:15:00Z</published>
+    <title>Test
+      Title</title>
+    <summary>  This is a test abstract.
+</summary>
+    <author><name>Author One</name></author>
+    <author><name>Author Two</name></author>
+    <arxiv:comment>A test comment.</arxiv:comment>
+    <link href="http://arxiv.org/abs/cs/0102003v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/cs/0102003v1" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="cs.AI"/>
+    <category term="cs.AI"/>
+    <category term="cs.LG"/>
+  </entry>
+</feed>"""
+    papers = ArxivService()._parse_feed(body)
+    assert papers == [{
+        "id": "cs/0102003v1",
+        "title": "Test Title",
+        "authors": ("Author One", "Author Two"),
+        "abstract": "This is a test abstract.",
+        "pdf_url": "http://arxiv.org/pdf/cs/0102003v1",
+        "categories": ["cs.AI", "cs.LG"],
+        "published": "2001-02-03",
+        "updated": "2001-02-05",
+        "url": "http://arxiv.org/abs/cs/0102003v1",
+        "comment": "A test comment.",
+        "primary_category": "cs.AI"
+    }]
+
+
+@pytest.mark.parametrize("pref,expected", [
+    ("relevance", "relevance"),
+    ("lastUpdatedDate", "lastUpdatedDate"),
+    ("submittedDate", "submittedDate"),
+    (None, "relevance"), # Default
+])
+def test_search_papers_sort_by_preference(arxiv_service, reset_arxiv_mock, pref, expected):
     """Test that search_papers uses the sort_by_preference."""
+    kwargs = {"sort_by_preference": pref} if pref else {}
+    arxiv_service.search_papers(topics=["AI"], **kwargs)
+    assert reset_arxiv_mock.call_args.args[1]["sortBy"] == expected
+
+
+def test_search_papers_ors_topics_and_categories_into_one_query(arxiv_service, reset_arxiv_mock):
+    reset_arxiv_mock.return_value = _atom_feed("2301.00001v1", "2301.00002v1", "2301.00003v1")
+    papers, total = arxiv_service.search_papers(
+        topics=["t1", "t2", "t3"], categories=["c1", "c2", "c3"], max_results=9
+    )
+
+    reset_arxiv_mock.assert_awaited_once()
+    params = reset_arxiv_mock.call_args.args[1]
+    assert params["search_query"].startswith("(all:t1 OR all:t2 OR all:t3) AND (cat:c1 OR cat:c2 OR cat:c3)")
+    assert params["max_results"] == 9
+    assert [paper["id"] for paper in papers] == ["2301.00001v1", "2301.00002v1", "2301.00003v1"]
+    assert total == 3
+    assert papers[0]["authors"] == ("Author One",)
+    assert papers[0]["primary_category"] == "cs.AI"
+    assert papers[0]["published"] == "2023-01-01"
+
+
+def test_search_papers_drops_papers_repeated_across_pages(arxiv_service, reset_arxiv_mock):
+    async def fake_fetch(session, params):
+        return _atom_feed(f"2301.{params['start']:05d}v1", "2301.00099v1")
+
+    reset_arxiv_mock.side_effect = fake_fetch
+    papers, total = arxiv_service.search_papers(topics=["AI"], max_results=150)
+
+    assert [paper["id"] for paper in papers] == ["2301.00000v1", "2301.00099v1", "2301.00100v1"]
+    assert total == 3
+
+@patch('asyncio.sleep', new_callable=AsyncMock)
+def test_request_pacer_spaces_calls_across_event_loops(mock_sleep):
+    pacer = _RequestPacer(10)
+
+    # Each sync service call runs its own event loop; the pacer must hold across them
+    asyncio.run(pacer.wait())
+    asyncio.run(pacer.wait())
+
+    mock_sleep.assert_awaited_once()
+    assert mock_sleep.call_args.args[0] == pytest.approx(10, abs=1)
+
+def test_get_papers_by_ids_is_paced(arxiv_service, reset_arxiv_mock):
+    with patch.object(ArxivService.RATE_LIMITER, "wait", new_callable=AsyncMock) as mock_wait:
+        arxiv_service.get_papers_by_ids(["2305.00001v1", "2305.00002v1"])
+
+    mock_wait.assert_awaited_once()
+
+
+def _oai_page(paper_ids, token=""):
+    """Build a ListRecords response holding the given papers and resumption token."""
+    records = "".join(f"""
+    <record>
+      <header><identifier>oai:arXiv.org:{paper_id}</identifier><datestamp>2023-01-02</datestamp></header>
+      <metadata>
+        <arXiv xmlns="http://arxiv.org/OAI/arXiv/">
+          <id>{paper_id}</id><created>2023-01-01</created><updated>2023-01-02</updated>
+          <authors><author><keyname>One</keyname><forenames>Author</forenames></author></authors>
+          <title>Paper
+            {paper_id}</title>
+          <categories>cs.AI cs.LG</categories>
+          <abstract>Abstract {paper_id}</abstract>
+        </arXiv>
+      </metadata>
+    </record>""" for paper_id in paper_ids)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+  <ListRecords>{records}
+    <record><header status="deleted"><identifier>oai:arXiv.org:gone</identifier></header></record>
+    <resumptionToken cursor="0">{token}</resumptionToken>
+  </ListRecords>
+</OAI-PMH>""".encode()
+
+def test_harvest_resumption():
     service = ArxivService()
-    mock_arxiv_client.results.return_value = iter([
-        MockArxivResult(entry_id_url="http://arxiv.org/abs/2301.00001v1", title="Test Paper 1", summary="Abstract 1")
-    ])
-
-    service.search_papers(topics=["AI"], sort_by_preference="relevance")
-    args, kwargs = mock_arxiv_client.results.call_args
-    search_instance_relevance = args[0]
-    assert search_instance_relevance.sort_by == arxiv.SortCriterion.Relevance
-
-    service.search_papers(topics=["AI"], sort_by_preference="lastUpdatedDate")
-    args, kwargs = mock_arxiv_client.results.call_args
-    search_instance_last_updated = args[0]
-    assert search_instance_last_updated.sort_by == arxiv.SortCriterion.LastUpdatedDate
-
-    service.search_papers(topics=["AI"], sort_by_preference="submittedDate")
-    args, kwargs = mock_arxiv_client.results.call_args
-    search_instance_submitted_date = args[0]
-    assert search_instance_submitted_date.sort_by == arxiv.SortCriterion.SubmittedDate
-
-    service.search_papers(topics=["AI"]) # Default
-    args, kwargs = mock_arxiv_client.results.call_args
-    search_instance_default = args[0]
-    assert search_instance_default.sort_by == arxiv.SortCriterion.Relevance
\ No newline at end of file
+    service.oai_session = MagicMock()
+    service.oai_session.get.side_effect = [
+        MagicMock(content=_oai_page(["2301.00001", "2301.00002"], token="page2")),
+        MagicMock(content=_oai_page(["2301.00003"])),
+    ]
+
+    papers = list(service.harvest(datetime(2023, 1, 1).date(), set_spec="cs"))
+
+    assert [paper["id"] for paper in papers] == ["2301.00001", "2301.00002", "2301.00003"]
+    assert papers[0]["title"] == "Paper 2301.00001"
+    assert papers[0]["authors"] == ("Author One",)
+    assert papers[0]["categories"] == ["cs.AI", "cs.LG"]
+    assert papers[0]["primary_category"] == "cs.AI"
+    assert papers[0]["updated"] == "2023-01-02"
+
+    first, second = (c.kwargs["params"] for c in service.oai_session.get.call_args_list)
+    assert first == {"verb": "ListRecords", "metadataPrefix": "arXiv", "from": "2023-01-01", "set": "cs"}
+    assert second == {"verb": "ListRecords", "resumptionToken": "page2"}
@@ -0,0 +1,56 @@
+# tests/test_disk_cache.py
+import os
+import pytest
+from unittest.mock import patch
+
+from app.services.disk_cache import DiskCache
+
+# --- Pytest Fixtures ---
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path), max_bytes=1000, suffix=".bin", name="test")
+
+def _age(cache, key, mtime):
+    os.utime(cache.path(key), (mtime, mtime))
+
+# --- Tests ---
+def test_set_then_get_round_trips(cache):
+    cache.set("ab01", b"data")
+
+    assert cache.get("ab01") == b"data"
+    assert cache.get("ab02") is None
+    assert cache.path("ab01").endswith(os.path.join("ab", "ab01.bin"))
+
+def test_without_directory_every_lookup_misses():
+    cache = DiskCache(None, max_bytes=1000, suffix=".bin")
+    cache.set("ab01", b"data")
+
+    assert cache.get("ab01") is None
+
+def test_prune_evicts_least_recently_used_down_to_target(cache):
+    cache.max_bytes = 10000
+    for n in range(4):
+        key = f"k{n}"
+        cache.set(key, b"x" * 300)
+        _age(cache, key, n)
+    cache.get("k0") # Reading makes the oldest entry the most recent
+
+    # 1200 bytes against a 1000 byte limit; eviction stops at 900
+    cache.max_bytes = 1000
+    cache.prune()
+
+    assert cache.get("k1") is None
+    assert [cache.get(f"k{n}") is not None for n in (0, 2, 3)] == [True, True, True]
+
+def test_writes_only_walk_the_directory_past_the_limit(cache):
+    with patch("app.services.disk_cache.os.walk", wraps=os.walk) as walk:
+        cache.set("k0", b"x" * 300) # The first write measures the cache
+        cache.set("k1", b"x" * 300)
+        cache.set("k1", b"y" * 300) # Replacing an entry doesn't grow the cache
+        cache.set("k2", b"x" * 300)
+        assert walk.call_count == 1
+
+        cache.set("k3", b"x" * 300)
+        assert walk.call_count == 2
+
+    assert sum(cache.get(f"k{n}") is not None for n in range(4)) == 3
@@ -9,6 +9,7 @@ from app import db as flask_db # Import the main db instance from your app
 from datetime import datetime, timezone
 
 
+@pytest.mark.celery
 class TestPodcastAPI:
     """Test podcast API endpoints."""
 
@@ -56,14 +57,10 @@ class TestPodcastAPI:
         """Test creating a new podcast using specific paper_ids."""
         paper_ids_to_use = ["paper_id_A", "paper_id_B"]
 
-        def side_effect_get_paper_by_id(paper_id, _retry_count=0):
-            if paper_id == "paper_id_A":
-                return {'id': 'paper_id_A', 'title': 'Paper A Title', 'abstract': 'Abstract A', 'authors': ['Author A']}
-            if paper_id == "paper_id_B":
-                return {'id': 'paper_id_B', 'title': 'Paper B Title', 'abstract': 'Abstract B', 'authors': ['Author B']}
-            return None
-        mock_arxiv_service.get_paper_by_id_side_effect = side_effect_get_paper_by_id
-        mock_arxiv_service.get_paper_by_id.side_effect = side_effect_get_paper_by_id
+        mock_arxiv_service.get_papers_by_ids.return_value = [
+            {'id': 'paper_id_A', 'title': 'Paper A Title', 'abstract': 'Abstract A', 'authors': ['Author A']},
+            {'id': 'paper_id_B', 'title': 'Paper B Title', 'abstract': 'Abstract B', 'authors': ['Author B']}
+        ]
 
 
         response = client.post(
@@ -82,9 +79,8 @@ class TestPodcastAPI:
         assert 'podcast_id' in data
         podcast_id = data['podcast_id']
 
-        assert mock_arxiv_service.get_paper_by_id.call_count == len(paper_ids_to_use)
-        mock_arxiv_service.get_paper_by_id.assert_any_call("paper_id_A")
-        mock_arxiv_service.get_paper_by_id.assert_any_call("paper_id_B")
+        mock_arxiv_service.get_papers_by_ids.assert_called_once_with(paper_ids_to_use)
+        mock_arxiv_service.get_paper_by_id.assert_not_called()
 
         mock_gemini_service.generate_script.assert_called_once()
         gemini_call_kwargs = mock_gemini_service.generate_script.call_args.kwargs
@@ -92,6 +88,7 @@ class TestPodcastAPI:
         assert gemini_call_kwargs.get('papers')[0]['id'] == 'paper_id_A'
         assert gemini_call_kwargs.get('papers')[1]['id'] == 'paper_id_B'
 
+        db_session.expire_all()
         podcast_obj = db_session.get(Podcast, podcast_id)
         assert podcast_obj is not None
         assert podcast_obj.status == Podcast.STATUS_COMPLETED
@@ -103,7 +100,7 @@ class TestPodcastAPI:
                                                   mock_arxiv_service, mock_gemini_service,
                                                   mock_tts_service, mock_storage_service):
         """Test podcast creation when (mocked) audio generation fails."""
-        mock_tts_service.generate_audio_side_effect = Exception("Mock TTS Failure")
+        mock_tts_service.generate_audio.side_effect = Exception("Mock TTS Failure")
 
         response = client.post(
             '/api/v1/podcasts',
@@ -154,7 +151,7 @@ class TestPodcastAPI:
                                                   mock_arxiv_service, mock_gemini_service,
                                                   mock_tts_service, mock_storage_service):
         """Test podcast creation when (mocked) script generation fails."""
-        mock_gemini_service.generate_script_side_effect = Exception("Mock Gemini Script Failure")
+        mock_gemini_service.generate_script.side_effect = Exception("Mock Gemini Script Failure")
 
         response = client.post(
             '/api/v1/podcasts',
@@ -281,6 +278,7 @@ class TestPodcastAPI:
 
 
         current_db_session = flask_db.session
+        current_db_session.expire_all()
 
         podcast_obj = current_db_session.get(Podcast, podcast_id)
         assert podcast_obj is not None
@@ -335,7 +333,7 @@ class TestPodcastAPI:
         storage_call_kwargs_dict = mock_storage_service.upload_audio.call_args.kwargs
 
         assert len(storage_call_args_tuple) == 1
-        assert isinstance(storage_call_args_tuple[0], bytes)
+        assert hasattr(storage_call_args_tuple[0], 'read')
         assert 'filename' in storage_call_kwargs_dict
         assert storage_call_kwargs_dict['filename'].startswith(f"podcast_{podcast_id}_")
 
@@ -383,6 +381,7 @@ class TestArxivAPI:
         assert 'categories' in data
         assert any(cat['id'] == 'cs.AI' for cat in data['categories'])
 
+@pytest.mark.celery
 class TestPodcastTasks:
     def test_generate_script_task_uses_user_sort_preference(
         self, app, test_user, db_session,
@@ -419,7 +418,7 @@ class TestPodcastTasks:
         from app.tasks.podcast_tasks import generate_podcast_script
 
         with app.app_context():
-            with patch('app.tasks.podcast_tasks.generate_podcast_audio.delay') as mock_generate_audio_delay_in_test:
+            with patch('app.tasks.podcast_tasks.generate_podcast_audio.apply_async') as mock_generate_audio_delay_in_test:
                 mock_celery_async_result_in_test = MagicMock()
                 mock_celery_async_result_in_test.id = str(uuid.uuid4())
                 mock_generate_audio_delay_in_test.return_value = mock_celery_async_result_in_test
@@ -449,7 +448,7 @@ class TestPodcastTasks:
             task_type=GenerationTask.TYPE_AUDIO_GENERATION
         ).first()
         assert audio_task_record is not None
-        # Since generate_podcast_audio.delay is mocked, the audio task will remain in its initial QUEUED state.
+        # Since generate_podcast_audio.apply_async is mocked, the audio task will remain in its initial QUEUED state.
         # It won't proceed to COMPLETED unless the mock itself simulates that behavior.
         assert audio_task_record.status == GenerationTask.STATUS_QUEUED
         mock_generate_audio_delay_in_test.assert_called_once()
\ No newline at end of file
@@ -0,0 +1,71 @@
+# tests/test_tts_service.py
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.disk_cache import DiskCache
+from app.services.tts_service import TTSService, MAX_REQUEST_TEXT_BYTES, SEGMENT_PAUSE_MS
+
+BREAK = f'<break time="{SEGMENT_PAUSE_MS}ms"/>'
+
+# --- Pytest Fixtures ---
+@pytest.fixture
+def tts_service():
+    """A TTSService without a client; packing needs no Google credentials."""
+    return TTSService.__new__(TTSService)
+
+# --- Tests for _turn_job ---
+def test_turn_job_keeps_plain_turns_as_text(tts_service):
+    assert tts_service._turn_job("alex", "R&D matters.") == ("alex", "R&D matters.", False)
+
+def test_turn_job_applies_ssml_enhancements(tts_service):
+    speaker, text, is_ssml = tts_service._turn_job("alex", "AI & more")
+
+    assert is_ssml
+    assert text == '<say-as interpret-as="spell-out">A I</say-as> &amp; more'
+
+# --- Tests for _pack_jobs ---
+def test_pack_jobs_keeps_pause_between_merged_turns(tts_service):
+    jobs = [("alex", "First.", False), ("alex", "Second.", False), ("sam", "Reply.", False)]
+
+    packed = tts_service._pack_jobs(jobs)
+
+    assert packed == [
+        ("alex", f"First.{BREAK}Second.", True),
+        ("sam", "Reply.", False),
+    ]
+
+def test_pack_jobs_merges_plain_and_enhanced_turns(tts_service):
+    jobs = [tts_service._turn_job("alex", "R&D <fast>"), tts_service._turn_job("alex", "ML too")]
+
+    packed = tts_service._pack_jobs(jobs)
+
+    assert packed == [(
+        "alex",
+        f'R&amp;D &lt;fast&gt;{BREAK}<say-as interpret-as="spell-out">M L</say-as> too',
+        True,
+    )]
+
+def test_pack_jobs_respects_request_limit(tts_service):
+    turn = "word " * 200
+    jobs = [("alex", turn, False)] * 10
+
+    packed = tts_service._pack_jobs(jobs)
+
+    assert len(packed) > 1
+    assert all(len(text.encode("utf-8")) <= MAX_REQUEST_TEXT_BYTES for _, text, _ in packed)
+    assert sum(text.count(turn) for _, text, _ in packed) == 10
+
+# --- Tests for _synthesize_speech ---
+def test_synthesize_speech_sends_ssml_jobs_as_ssml(tts_service, tmp_path):
+    tts_service.sample_rate = 24000
+    tts_service.cache = DiskCache(str(tmp_path), 10 ** 6, suffix=".wav")
+    tts_service.voice_configs = {"alex": (MagicMock(), MagicMock())}
+    tts_service.client = MagicMock()
+    tts_service.client.synthesize_speech.return_value.audio_content = b"audio"
+
+    tts_service._synthesize_speech(f"One.{BREAK}Two.", "alex", is_ssml=True)
+    tts_service._synthesize_speech("One.", "alex")
+
+    ssml_request, text_request = (c.kwargs["request"] for c in tts_service.client.synthesize_speech.call_args_list)
+    assert ssml_request["input"].ssml == f"<speak>One.{BREAK}Two.</speak>"
+    assert text_request["input"].text == "One."